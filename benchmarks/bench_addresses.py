@@ -0,0 +1,43 @@
+"""Measures converting public keys to addresses under several prefixes.
+
+The "before" column derives each address through the native library, one
+FFI call per key and prefix. The "after" column uses
+`chainlibpy.utils.addresses_for_prefixes`, which hashes each public key once.
+
+Run with `python -m benchmarks.bench_addresses`.
+"""
+
+from chainlibpy.generated.common import Network, WalletCoin
+from chainlibpy.utils import addresses_for_prefixes
+from chainlibpy.wallet import Wallet
+
+from .utils import measure, report
+
+COUNT = 100
+HRPS = ["cro", "tcro", "devnet"]
+
+
+def main() -> None:
+    wallet = Wallet.new()
+    accounts = [wallet.account(index) for index in range(COUNT)]
+    keys = [account.secret_key for account in accounts]
+    public_keys = [account.public_key for account in accounts]
+    coins = [
+        WalletCoin.COSMOS_SDK(Network.OTHER(chain_id="", coin_type=394, bech32hrp=hrp))
+        for hrp in HRPS
+    ]
+
+    def native() -> None:
+        for coin in coins:
+            for key in keys:
+                key.to_address(coin)
+
+    before = measure(native, number=10) / COUNT
+    after = measure(lambda: addresses_for_prefixes(public_keys, HRPS), number=10) / COUNT
+    report(
+        f"Addresses under {len(HRPS)} prefixes (per public key)", [("addresses", before, after)]
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Measures `Wallet.derive_addresses` as the number of worker processes
+grows, against deriving every address in this process.
+
+Run with `python -m benchmarks.bench_derive_addresses`.
+"""
+
+import os
+import time
+
+from chainlibpy.wallet import Wallet
+
+from .utils import SEED, report
+
+COUNT = 20_000
+
+
+def derive(wallet: Wallet, workers: int) -> float:
+    start = time.perf_counter()
+    for _ in wallet.derive_addresses(0, COUNT, workers=workers):
+        pass
+    return (time.perf_counter() - start) / COUNT
+
+
+def main() -> None:
+    wallet = Wallet(SEED)
+    serial = derive(wallet, 1)
+    report(
+        f"Wallet.derive_addresses, {COUNT} addresses on {os.cpu_count()} cores (per address)",
+        [(f"{workers} workers", serial, derive(wallet, workers)) for workers in (2, 4, 8)],
+    )
+
+
+if __name__ == "__main__":
+    main()
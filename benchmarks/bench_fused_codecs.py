@@ -0,0 +1,61 @@
+"""Compares the generated converters with the fused codecs of
+`chainlibpy.fused_codecs` for the records on the signing hot path.
+
+Run with `python -m benchmarks.bench_fused_codecs`.
+"""
+
+from typing import Any
+
+from chainlibpy import fused_codecs
+from chainlibpy.generated.common import (
+    CosmosSdkMsg,
+    CosmosSdkTxInfo,
+    FfiConverterSequenceTypeCosmosSdkMsg,
+    FfiConverterTypeCosmosSdkTxInfo,
+    FfiConverterTypeTxBroadcastResult,
+    Network,
+    SingleCoin,
+    TxBroadcastResult,
+)
+
+from .utils import measure, report
+
+ADDRESS = "cro1yj3fd8gxrqd2662p8ywp26t4hfws9p5n75xjum"
+
+
+def main() -> None:
+    tx_info = CosmosSdkTxInfo(
+        1,
+        2,
+        200_000,
+        SingleCoin.OTHER("100000000", "basecro"),
+        0,
+        "payout",
+        Network.OTHER("crypto-org-chain-mainnet-1", 394, "cro"),
+    )
+    msgs = [CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.OTHER("1000", "basecro"))] * 10
+    result = TxBroadcastResult("AB" * 32, 0, "[]")
+
+    cases = [
+        ("CosmosSdkTxInfo", FfiConverterTypeCosmosSdkTxInfo, tx_info),
+        ("10 x CosmosSdkMsg.BANK_SEND", FfiConverterSequenceTypeCosmosSdkMsg, msgs),
+        ("TxBroadcastResult", FfiConverterTypeTxBroadcastResult, result),
+    ]
+
+    fused_codecs.install()
+    rows = []
+    for name, converter, value in cases:
+
+        def run(converter: Any = converter, value: Any = value) -> None:
+            converter.lift(converter.lower(value))
+
+        with fused_codecs.generic_codecs():
+            before = measure(run)
+        after = measure(run)
+        rows.append((name, before, after))
+
+    report("Generated vs fused codecs (round trip through a RustBuffer)", rows)
+
+
+if __name__ == "__main__":
+    main()
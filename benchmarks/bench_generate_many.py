@@ -0,0 +1,55 @@
+"""Measures generating new wallets with `Wallet.generate_many`.
+
+The "before" column generates each wallet as `Wallet.new()` originally did,
+recovering it again from the generated mnemonic. Both columns read each
+wallet's address.
+
+Run with `python -m benchmarks.bench_generate_many`.
+"""
+
+import os
+import time
+from typing import Callable, List
+
+from chainlibpy.generated.common import HdWallet, MnemonicWordCount
+from chainlibpy.wallet import Wallet
+
+from .utils import report
+
+COUNT = 200
+
+
+def generate_with_round_trip() -> List[Wallet]:
+    wallets = []
+    for _ in range(COUNT):
+        seed = HdWallet.generate_wallet(
+            password=None, word_count=MnemonicWordCount.TWENTY_FOUR
+        ).get_backup_mnemonic_phrase()
+        wallets.append(Wallet(seed))
+    return wallets
+
+
+def per_wallet(generate: Callable[[], List[Wallet]]) -> float:
+    start = time.perf_counter()
+    for wallet in generate():
+        wallet.address
+    return (time.perf_counter() - start) / COUNT
+
+
+def main() -> None:
+    before = per_wallet(generate_with_round_trip)
+    report(
+        f"Generating {COUNT} wallets on {os.cpu_count()} cores (per wallet)",
+        [
+            (
+                f"generate_many, {workers} workers",
+                before,
+                per_wallet(lambda workers=workers: Wallet.generate_many(COUNT, workers=workers)),
+            )
+            for workers in (1, 4)
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
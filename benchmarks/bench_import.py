@@ -0,0 +1,47 @@
+"""Measures a cold `import chainlibpy` in a fresh interpreter.
+
+The "before" column also loads the native library and binds every FFI symbol,
+which the generated bindings originally did at import time. The "after"
+column only imports, leaving symbols to be bound on first use.
+
+Run with `python -m benchmarks.bench_import`.
+"""
+
+import subprocess
+import sys
+import time
+
+from .utils import report
+
+IMPORT = "import chainlibpy"
+IMPORT_AND_BIND = (
+    "import chainlibpy\n"
+    "from chainlibpy.generated import common\n"
+    "common._UniFFILib.bind_all()\n"
+)
+
+
+def cold_start(code: str, repeat: int = 10) -> float:
+    """Returns the best wall-clock time of running `code` in a new
+    interpreter, less the time of starting an empty one."""
+
+    def best(code: str) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], check=True)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    return best(code) - best("pass")
+
+
+def main() -> None:
+    report(
+        "Cold import of chainlibpy",
+        [("import chainlibpy", cold_start(IMPORT_AND_BIND), cold_start(IMPORT))],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Measures starting up with many wallets from a `KeyCache`, against
+recovering each of them from its seed.
+
+Both columns load every wallet and read its address. The "after" column
+includes opening the cache, i.e. reading the file and running the KDF once.
+
+Run with `python -m benchmarks.bench_key_cache`.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from chainlibpy.key_cache import KeyCache
+from chainlibpy.wallet import Wallet
+
+from .utils import report
+
+COUNT = 200
+PASSPHRASE = "benchmark"
+
+
+def start_up(seeds: List[str], cache_path: Optional[Path] = None) -> float:
+    start = time.perf_counter()
+    cache = KeyCache(cache_path, PASSPHRASE) if cache_path is not None else None
+    for seed in seeds:
+        Wallet(seed, cache=cache).address
+    return (time.perf_counter() - start) / len(seeds)
+
+
+def main() -> None:
+    seeds = [Wallet.new().wallet.get_backup_mnemonic_phrase() for _ in range(COUNT)]
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = Path(directory) / "keys.cache"
+        cache = KeyCache(cache_path, PASSPHRASE)
+        for seed in seeds:
+            Wallet(seed, cache=cache)
+        cache.save()
+
+        report(
+            f"Starting up with {COUNT} wallets (per wallet)",
+            [("KeyCache", start_up(seeds), start_up(seeds, cache_path))],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Measures the cost of lifting records out of RustBuffers.
+
+The "before" column uses a stream that slices a temporary bytes object out
+of the buffer and parses a format string on every primitive read, as the
+generated bindings originally did. The "after" column uses the memoryview
+based `RustBufferStream`.
+
+Run with `python -m benchmarks.bench_lifting`.
+"""
+
+import struct
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from chainlibpy.generated import common
+from chainlibpy.generated.common import (
+    BaseNft,
+    Collection,
+    CosmosSdkMsg,
+    Denom,
+    FfiConverterSequenceTypeCosmosSdkMsg,
+    FfiConverterTypeCollection,
+    RustBuffer,
+    RustBufferBuilder,
+    SingleCoin,
+)
+
+from .utils import measure, report
+
+ADDRESS = "cro1yj3fd8gxrqd2662p8ywp26t4hfws9p5n75xjum"
+
+
+class SlicingRustBufferStream(common.RustBufferStream):
+    """Reference stream which copies every read out of the buffer before
+    unpacking it."""
+
+    def _unpack_from(self, size: int, unpacker: struct.Struct) -> Any:
+        if self.offset + size > self.rbuf.len:
+            raise common.InternalError("read past end of rust buffer")
+        value = struct.unpack(unpacker.format, self.rbuf.data[self.offset : self.offset + size])[0]
+        self.offset += size
+        return value
+
+    def read(self, size: int) -> bytes:
+        if self.offset + size > self.rbuf.len:
+            raise common.InternalError("read past end of rust buffer")
+        data = self.rbuf.data[self.offset : self.offset + size]
+        self.offset += size
+        return data
+
+
+@contextmanager
+def slicing_stream() -> Iterator[None]:
+    original = common.RustBufferStream
+    common.RustBufferStream = SlicingRustBufferStream  # type: ignore
+    try:
+        yield
+    finally:
+        common.RustBufferStream = original  # type: ignore
+
+
+def encode(converter: Any, value: Any) -> bytes:
+    rbuf = converter.lower(value)
+    try:
+        return rbuf.data[0 : rbuf.len]
+    finally:
+        rbuf.free()
+
+
+def to_rust_buffer(data: bytes) -> RustBuffer:
+    builder = RustBufferBuilder()
+    builder.write(data)
+    return builder.finalize()
+
+
+def main() -> None:
+    collection = Collection(
+        Denom("denomid", "name", "schema", ADDRESS),
+        [BaseNft(f"nft{i}", "name", "https://example.com/nft", "{}", ADDRESS) for i in range(500)],
+    )
+    msgs = [CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.BASE_CRO(i)) for i in range(200)]
+
+    cases = [
+        ("Collection with 500 NFTs", FfiConverterTypeCollection, collection),
+        ("200 x CosmosSdkMsg.BANK_SEND", FfiConverterSequenceTypeCosmosSdkMsg, msgs),
+    ]
+
+    rows = []
+    for name, converter, value in cases:
+        data = encode(converter, value)
+
+        def run(converter: Any = converter, data: bytes = data) -> None:
+            converter.lift(to_rust_buffer(data))
+
+        with slicing_stream():
+            before = measure(run, number=50)
+        after = measure(run, number=50)
+        rows.append((name, before, after))
+
+    report("Lifting from RustBuffer", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Measures `Wallet.load_many` with 1, 2, 4 and 8 workers, against
+recovering the wallets one after the other.
+
+Run with `python -m benchmarks.bench_load_many`.
+"""
+
+import os
+import time
+from typing import List
+
+from chainlibpy.wallet import Wallet
+
+from .utils import report
+
+COUNT = 200
+
+
+def load(seeds: List[str], workers: int, processes: bool = False) -> float:
+    start = time.perf_counter()
+    Wallet.load_many(seeds, workers=workers, processes=processes)
+    return (time.perf_counter() - start) / len(seeds)
+
+
+def main() -> None:
+    seeds = [Wallet.new().wallet.get_backup_mnemonic_phrase() for _ in range(COUNT)]
+    serial = load(seeds, 1)
+    rows = [(f"{workers} threads", serial, load(seeds, workers)) for workers in (2, 4, 8)]
+    rows += [(f"{workers} processes", serial, load(seeds, workers, True)) for workers in (2, 4, 8)]
+    report(f"Wallet.load_many, {COUNT} wallets on {os.cpu_count()} cores (per wallet)", rows)
+
+
+if __name__ == "__main__":
+    main()
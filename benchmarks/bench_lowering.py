@@ -0,0 +1,91 @@
+"""Measures the cost of lowering common values into RustBuffers.
+
+The "before" column uses a builder that copies bytes one at a time, as the
+generated bindings originally did, and the "after" column uses the bulk
+`ctypes.memmove` write path of `RustBufferBuilder`.
+
+Run with `python -m benchmarks.bench_lowering`.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from chainlibpy.generated import common
+from chainlibpy.generated.common import (
+    CosmosSdkMsg,
+    CosmosSdkTxInfo,
+    FfiConverterSequenceTypeCosmosSdkMsg,
+    FfiConverterString,
+    FfiConverterTypeCosmosSdkTxInfo,
+    Network,
+    RustBuffer,
+    SingleCoin,
+)
+
+from .utils import measure, report
+
+ADDRESS = "cro1yj3fd8gxrqd2662p8ywp26t4hfws9p5n75xjum"
+
+
+class PerByteRustBufferBuilder(common.RustBufferBuilder):
+    """Reference builder which writes every byte with a separate index
+    assignment."""
+
+    def write(self, value: bytes) -> None:
+        size = len(value)
+        if self.rbuf.len + size > self.rbuf.capacity:
+            self.rbuf = RustBuffer.reserve(self.rbuf, size)
+        for i, byte in enumerate(value):
+            self.rbuf.data[self.rbuf.len + i] = byte
+        self.rbuf.len += size
+
+
+@contextmanager
+def per_byte_builder() -> Iterator[None]:
+    original = common.RustBufferBuilder
+    common.RustBufferBuilder = PerByteRustBufferBuilder  # type: ignore
+    try:
+        yield
+    finally:
+        common.RustBufferBuilder = original  # type: ignore
+
+
+def lower_and_free(converter: Any, value: Any) -> None:
+    converter.lower(value).free()
+
+
+def main() -> None:
+    tx_info = CosmosSdkTxInfo(
+        1,
+        2,
+        200_000,
+        SingleCoin.OTHER("100000000", "basecro"),
+        0,
+        "payout",
+        Network.OTHER("crypto-org-chain-mainnet-1", 394, "cro"),
+    )
+    msgs = [CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.OTHER("1000", "basecro"))] * 10
+    long_memo = "m" * 4_096
+
+    cases = [
+        ("CosmosSdkTxInfo", FfiConverterTypeCosmosSdkTxInfo, tx_info),
+        ("10 x CosmosSdkMsg.BANK_SEND", FfiConverterSequenceTypeCosmosSdkMsg, msgs),
+        ("4 KiB string", FfiConverterString, long_memo),
+    ]
+
+    rows = []
+    for name, converter, value in cases:
+
+        def run(converter: Any = converter, value: Any = value) -> None:
+            lower_and_free(converter, value)
+
+        with per_byte_builder():
+            before = measure(run)
+        after = measure(run)
+        rows.append((name, before, after))
+
+    report("Lowering into RustBuffer", rows)
+
+
+if __name__ == "__main__":
+    main()
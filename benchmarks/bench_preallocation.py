@@ -0,0 +1,77 @@
+"""Measures lowering the arguments of `build_signed_msg_tx` with RustBuffers
+that grow from the default capacity ("before") against RustBuffers allocated
+at their exact encoded size ("after"), and prints the allocator calls made
+per lowering.
+
+Run with `python -m benchmarks.bench_preallocation`.
+"""
+
+from contextlib import nullcontext
+from typing import Any
+
+from chainlibpy import fused_codecs
+from chainlibpy.ffi_support import RustBufferBuilder, rust_buffer_stats
+from chainlibpy.generated.common import (
+    CosmosSdkMsg,
+    CosmosSdkTxInfo,
+    FfiConverterSequenceTypeCosmosSdkMsg,
+    FfiConverterTypeCosmosSdkTxInfo,
+    Network,
+    SingleCoin,
+)
+
+from .utils import measure, report
+
+ADDRESS = "cro1yj3fd8gxrqd2662p8ywp26t4hfws9p5n75xjum"
+
+
+def lower_growing(converter: Any, value: Any) -> None:
+    builder = RustBufferBuilder()
+    converter.write(value, builder)
+    builder.finalize().free()
+
+
+def lower_exact(converter: Any, value: Any) -> None:
+    converter.lower(value).free()
+
+
+def main() -> None:
+    tx_info = CosmosSdkTxInfo(
+        1,
+        2,
+        200_000,
+        SingleCoin.OTHER("100000000", "basecro"),
+        0,
+        "payout",
+        Network.OTHER("crypto-org-chain-mainnet-1", 394, "cro"),
+    )
+    msgs = [CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.OTHER("1000", "basecro"))] * 10
+    cases = [
+        ("CosmosSdkTxInfo", FfiConverterTypeCosmosSdkTxInfo, tx_info),
+        ("10 x CosmosSdkMsg.BANK_SEND", FfiConverterSequenceTypeCosmosSdkMsg, msgs),
+    ]
+
+    fused_codecs.install()
+    rows = []
+    for codecs, context in (("generated", fused_codecs.generic_codecs), ("fused", nullcontext)):
+        for name, converter, value in cases:
+            label = f"{name} ({codecs})"
+            with context():
+                for lower in (lower_growing, lower_exact):
+                    rust_buffer_stats.reset()
+                    lower(converter, value)
+                    print(f"{label} {lower.__name__}: {rust_buffer_stats.snapshot()}")
+
+                def run_growing(converter: Any = converter, value: Any = value) -> None:
+                    lower_growing(converter, value)
+
+                def run_exact(converter: Any = converter, value: Any = value) -> None:
+                    lower_exact(converter, value)
+
+                rows.append((label, measure(run_growing), measure(run_exact)))
+
+    report("Growing vs exact-size RustBuffer allocation", rows)
+
+
+if __name__ == "__main__":
+    main()
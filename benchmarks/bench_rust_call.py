@@ -0,0 +1,72 @@
+"""Measures the fixed per-call overhead of `rust_call` on a call that does
+almost nothing on the rust side, `SecretKey.to_hex`.
+
+The "before" column uses a `rust_call` which allocates a fresh
+`RustCallStatus` and argument tuple for every call and goes through
+`rust_call_with_error`, as the generated bindings originally did. The "after"
+column uses the thread-local, reused call status.
+
+Run with `python -m benchmarks.bench_rust_call`.
+"""
+
+import ctypes
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from chainlibpy.generated import common
+from chainlibpy.generated.common import SecretKey
+
+from .utils import measure, report
+
+
+def allocating_rust_call(fn: Any, *args: Any) -> Any:
+    call_status = common.RustCallStatus(
+        code=common.RustCallStatus.CALL_SUCCESS, error_buf=common.RustBuffer(0, 0, None)
+    )
+    args_with_error = args + (ctypes.byref(call_status),)
+    result = fn(*args_with_error)
+    if call_status.code == common.RustCallStatus.CALL_SUCCESS:
+        return result
+    common._raise_call_error(None, call_status)
+
+
+def allocating_rust_call_with_error(fn: Any, *args: Any) -> Any:
+    return allocating_rust_call(fn, *args)
+
+
+@contextmanager
+def allocating_call_status() -> Iterator[None]:
+    original = common.rust_call
+    common.rust_call = allocating_rust_call_with_error  # type: ignore
+    try:
+        yield
+    finally:
+        common.rust_call = original  # type: ignore
+
+
+def main() -> None:
+    key = SecretKey()
+    to_hex = common._UniFFILib.common_ad00_SecretKey_to_hex
+    pointer = key._pointer
+
+    def call_only() -> None:
+        common.rust_call(to_hex, pointer).free()
+
+    def to_hex_method() -> None:
+        key.to_hex()
+
+    rows = []
+    for name, run in (
+        ("rust_call(SecretKey_to_hex)", call_only),
+        ("SecretKey.to_hex()", to_hex_method),
+    ):
+        with allocating_call_status():
+            before = measure(run, number=10_000)
+        after = measure(run, number=10_000)
+        rows.append((name, before, after))
+
+    report("Per-call overhead of rust_call", rows)
+
+
+if __name__ == "__main__":
+    main()
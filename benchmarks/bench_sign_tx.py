@@ -0,0 +1,73 @@
+"""Measures `Wallet.sign_tx` throughput.
+
+The "before" column derives the key from the seed for every signature, as
+`Wallet` originally did. The "after" column signs with the key the wallet
+derived once and cached. The batch rows compare signing one transaction at
+a time with `Wallet.sign_txs`, per transaction.
+
+Run with `python -m benchmarks.bench_sign_tx`.
+"""
+
+from chainlibpy.generated.common import (
+    CosmosSdkMsg,
+    CosmosSdkTxInfo,
+    Network,
+    SingleCoin,
+    build_signed_msg_tx,
+)
+from chainlibpy.wallet import Wallet
+
+from .utils import SEED, measure, report
+
+ADDRESS = "cro1yj3fd8gxrqd2662p8ywp26t4hfws9p5n75xjum"
+BATCH = 1_000
+
+
+def main() -> None:
+    wallet = Wallet(SEED)
+    tx_info = CosmosSdkTxInfo(
+        1,
+        2,
+        200_000,
+        SingleCoin.OTHER("100000000", "basecro"),
+        0,
+        "payout",
+        Network.OTHER("crypto-org-chain-mainnet-1", 394, "cro"),
+    )
+    msgs = [CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.OTHER("1000", "basecro"))]
+
+    def derive_and_sign() -> None:
+        with wallet.wallet.get_key(wallet.path) as key:
+            build_signed_msg_tx(tx_info, msgs, key)
+
+    def sign_with_cached_key() -> None:
+        wallet.sign_tx(tx_info, msgs)
+
+    before = measure(derive_and_sign)
+    after = measure(sign_with_cached_key)
+    report("Wallet.sign_tx", [("sign 1 x BANK_SEND", before, after)])
+    print(f"  throughput: {1 / before:,.0f}/s before, {1 / after:,.0f}/s after")
+
+    items = [(tx_info, msgs)] * BATCH
+
+    def sign_one_by_one() -> None:
+        for tx_info_, msgs_ in items:
+            wallet.sign_tx(tx_info_, msgs_)
+
+    one_by_one = measure(sign_one_by_one, number=5) / BATCH
+    report(
+        f"Wallet.sign_txs, {BATCH} transactions (per transaction)",
+        [
+            (
+                f"{workers} workers",
+                one_by_one,
+                measure(lambda workers=workers: list(wallet.sign_txs(items, workers)), number=5)
+                / BATCH,
+            )
+            for workers in (1, 4)
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Measures signing payouts with a `TransactionTemplate`.
+
+The "before" column creates a `Transaction` for each payout, with an
+explicit sequence so that no network call is made. The "after" column signs
+with a template, which only encodes the sequence and messages of each
+payout.
+
+Run with `python -m benchmarks.bench_transaction_template`.
+"""
+
+from itertools import count
+
+from chainlibpy.generated.common import CosmosSdkMsg, SingleCoin
+from chainlibpy.transaction import Transaction, TransactionTemplate
+from chainlibpy.wallet import Wallet
+
+from .utils import SEED, measure, report
+
+ADDRESS = "cro1yj3fd8gxrqd2662p8ywp26t4hfws9p5n75xjum"
+CHAIN_ID = "crypto-org-chain-mainnet-1"
+FEE = SingleCoin.OTHER("5000", "basecro")
+
+
+def main() -> None:
+    wallet = Wallet(SEED)
+    template = TransactionTemplate(CHAIN_ID, wallet, 1, fee=FEE, memo="payout")
+    msgs = [CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.OTHER("1000", "basecro"))]
+    sequences = count()
+
+    def per_tx_construction() -> None:
+        Transaction(
+            CHAIN_ID, wallet, msgs, 1, fee=FEE, memo="payout", sequence=next(sequences)
+        ).signed_tx
+
+    def from_template() -> None:
+        template.sign(next(sequences), msgs)
+
+    report(
+        "Signing a payout",
+        [("1 x BANK_SEND", measure(per_tx_construction), measure(from_template))],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import timeit
+from typing import Callable, Iterable, Tuple
+
+# mnemonic of the wallets in benchmarks
+SEED = "burst negative solar evoke traffic yard lizard next series foster seminar enter wrist captain bulb trap giggle country sword season shoot boy bargain deal"  # noqa: 501
+
+
+def measure(fn: Callable[[], object], number: int = 1_000, repeat: int = 5) -> float:
+    """Returns the best observed time of a single `fn()` call, in seconds."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def report(title: str, rows: Iterable[Tuple[str, float, float]]) -> None:
+    """Prints a before/after table of per-call timings."""
+    print(title)
+    print(f"  {'case':<40} {'before':>12} {'after':>12} {'speedup':>8}")
+    for name, before, after in rows:
+        print(
+            f"  {name:<40} {before * 1e6:>10.2f}us {after * 1e6:>10.2f}us"
+            f" {before / after:>7.1f}x"
+        )
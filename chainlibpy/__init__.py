@@ -1,14 +1,55 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
 from .cro_coin import MAX_CRO_SUPPLY, CROCoin
-from .grpc_client import CRO_NETWORK, GrpcClient, NetworkConfig
-from .transaction import Transaction
-from .wallet import Wallet
+from .key_cache import KeyCache
+from .network_config import CRO_NETWORK, NetworkConfig
+
+if TYPE_CHECKING:
+    from .address_index import AddressIndex
+    from .gas import GasEstimator
+    from .grpc_client import GrpcClient
+    from .pipeline import TxPipeline
+    from .sequence_manager import SequenceManager
+    from .transaction import Transaction
+    from .wallet import Wallet
 
 __all__ = [
+    "AddressIndex",
     "CROCoin",
     "MAX_CRO_SUPPLY",
     "CRO_NETWORK",
+    "GasEstimator",
     "GrpcClient",
+    "KeyCache",
     "NetworkConfig",
+    "SequenceManager",
     "Transaction",
+    "TxPipeline",
     "Wallet",
 ]
+
+# Attributes backed by the native bindings, imported on first access (PEP 562) so that
+# pure-Python users such as CROCoin do not pay for them.
+_LAZY_ATTRIBUTES = {
+    "AddressIndex": ".address_index",
+    "GasEstimator": ".gas",
+    "GrpcClient": ".grpc_client",
+    "SequenceManager": ".sequence_manager",
+    "Transaction": ".transaction",
+    "TxPipeline": ".pipeline",
+    "Wallet": ".wallet",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Iterator, Optional, Tuple, Type
+
+from chainlibpy.generated.common import Network
+from chainlibpy.utils.types import PathLike
+from chainlibpy.wallet import Wallet
+
+DEFAULT_GAP_LIMIT = 20
+
+# File layout: a header followed by fixed-width records sorted by address. Each record is the
+# ASCII address, NUL-padded to the record's address width, and its big-endian u32 index.
+# The header identifies the addresses by the SHA-256 of the address at index 0, which depends on
+# the seed, derivation path and network.
+_MAGIC = b"CLPYAIX2"
+# magic, fingerprint, address width, record count, next index to derive
+_HEADER = struct.Struct(">8s32sHII")
+_INDEX = struct.Struct(">I")
+
+
+class AddressIndexFile:
+    """Read-only, memory-mapped view of an address index saved by
+    `AddressIndex.save()`.
+
+    Lookups binary search the sorted records, so the file is not read into
+    memory.
+
+    Args:
+        path (str): file written by `AddressIndex.save()`
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"{path} is not an address index file")
+            magic, self.fingerprint, self._width, self._count, self.next_index = _HEADER.unpack(
+                header
+            )
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not an address index file")
+            self._record_size = self._width + _INDEX.size
+            expected_size = _HEADER.size + self._count * self._record_size
+            if os.fstat(f.fileno()).st_size != expected_size:
+                raise ValueError(f"{path} is truncated or corrupted")
+            # mmap can not map empty files.
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self._count else None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _address_at(self, position: int) -> bytes:
+        assert self._map is not None
+        offset = _HEADER.size + position * self._record_size
+        return self._map[offset : offset + self._width]
+
+    def _index_at(self, position: int) -> int:
+        assert self._map is not None
+        offset = _HEADER.size + position * self._record_size + self._width
+        return _INDEX.unpack_from(self._map, offset)[0]
+
+    def index_of(self, address: str) -> Optional[int]:
+        """Returns the derivation index of `address`, or None if it is not in
+        the file."""
+        if not address.isascii():
+            return None
+        key = address.encode("ascii").ljust(self._width, b"\0")
+        if len(key) != self._width:
+            return None
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._address_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._address_at(low) == key:
+            return self._index_at(low)
+        return None
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        """Yields every `(address, index)` pair, sorted by address."""
+        for position in range(self._count):
+            address = self._address_at(position).rstrip(b"\0").decode("ascii")
+            yield address, self._index_at(position)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> "AddressIndexFile":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def _fingerprint(wallet: Wallet, network: Optional[Network]) -> bytes:
+    return hashlib.sha256(next(wallet.derive_addresses(0, 1, network)).encode("ascii")).digest()
+
+
+class AddressIndex:
+    """Maps the addresses of a range of HD address indices back to their
+    derivation index, e.g. to find the customer an incoming deposit belongs
+    to.
+
+    Addresses are derived with `Wallet.derive_addresses()` and kept in a
+    hash map. Like a wallet scanning for used addresses, the index keeps
+    `gap_limit` addresses derived past the highest index seen in a lookup.
+
+    Args:
+        wallet (Wallet): wallet the addresses belong to
+        network (Network, optional): network of the addresses. Defaults to
+            the addresses of the wallet's accounts.
+        gap_limit (int): number of addresses kept derived past the highest
+            used index. Defaults to DEFAULT_GAP_LIMIT.
+        workers (int, optional): worker processes used to derive addresses,
+            see `Wallet.derive_addresses()`
+    """
+
+    def __init__(
+        self,
+        wallet: Wallet,
+        network: Optional[Network] = None,
+        gap_limit: int = DEFAULT_GAP_LIMIT,
+        workers: Optional[int] = None,
+    ) -> None:
+        self._setup(wallet, network, gap_limit, workers, None)
+
+    def _setup(
+        self,
+        wallet: Wallet,
+        network: Optional[Network],
+        gap_limit: int,
+        workers: Optional[int],
+        file: Optional[AddressIndexFile],
+    ) -> None:
+        if gap_limit < 1:
+            raise ValueError(f"gap_limit should be at least 1, got {gap_limit}")
+        self._wallet = wallet
+        self._network = network
+        self._fingerprint = _fingerprint(wallet, network)
+        self._gap_limit = gap_limit
+        self._workers = workers
+        self._file = file
+        self._addresses: Dict[str, int] = {}
+        self._next_index = file.next_index if file is not None else 0
+        self._highest_used = -1
+        self.extend(max(0, gap_limit - self._next_index))
+
+    @classmethod
+    def load(
+        cls,
+        path: PathLike,
+        wallet: Wallet,
+        network: Optional[Network] = None,
+        gap_limit: int = DEFAULT_GAP_LIMIT,
+        workers: Optional[int] = None,
+    ) -> "AddressIndex":
+        """Opens an index saved by `save()`.
+
+        The saved addresses are looked up in the memory-mapped file, and only
+        indices past it are derived.
+
+        Args:
+            path (str): file written by `save()`
+            wallet (Wallet): wallet the addresses belong to
+            network (Network, optional): network the file was built for
+            gap_limit (int): see `AddressIndex`
+            workers (int, optional): see `AddressIndex`
+
+        Raises:
+            ValueError: the file was built for another wallet or network
+
+        Returns:
+            AddressIndex: index covering the saved addresses
+        """
+        file = AddressIndexFile(path)
+        if file.fingerprint != _fingerprint(wallet, network):
+            file.close()
+            raise ValueError(f"{path} was built for another wallet or network")
+        index = cls.__new__(cls)
+        index._setup(wallet, network, gap_limit, workers, file)
+        return index
+
+    @property
+    def next_index(self) -> int:
+        """The lowest index that has not been derived yet."""
+        return self._next_index
+
+    def __len__(self) -> int:
+        return self._next_index
+
+    def __contains__(self, address: object) -> bool:
+        return isinstance(address, str) and self._lookup(address) is not None
+
+    def extend(self, count: int) -> None:
+        """Derives the next `count` addresses."""
+        addresses = self._wallet.derive_addresses(
+            self._next_index, count, self._network, workers=self._workers
+        )
+        for index, address in enumerate(addresses, self._next_index):
+            self._addresses[address] = index
+        self._next_index += count
+
+    def _lookup(self, address: str) -> Optional[int]:
+        index = self._addresses.get(address)
+        if index is None and self._file is not None:
+            index = self._file.index_of(address)
+        return index
+
+    def index_of(self, address: str) -> Optional[int]:
+        """Returns the derivation index of `address`, or None if it is not
+        one of the indexed addresses.
+
+        A match marks the index as used, which derives more addresses if
+        fewer than `gap_limit` are left past it.
+        """
+        index = self._lookup(address)
+        if index is not None:
+            self.mark_used(index)
+        return index
+
+    def mark_used(self, index: int) -> None:
+        """Records that `index` has been used, keeping `gap_limit` addresses
+        derived past the highest used index."""
+        self._highest_used = max(self._highest_used, index)
+        missing = self._highest_used + self._gap_limit + 1 - self._next_index
+        if missing > 0:
+            self.extend(missing)
+
+    def save(self, path: PathLike) -> None:
+        """Writes every indexed address to `path` as sorted fixed-width
+        records, for `load()`.
+
+        The file is replaced atomically.
+        """
+        records = dict(self._file.items()) if self._file is not None else {}
+        records.update(self._addresses)
+        width = max((len(address) for address in records), default=0)
+
+        path = Path(path)
+        temporary = path.with_name(path.name + ".tmp")
+        with open(temporary, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self._fingerprint, width, len(records), self._next_index))
+            for address in sorted(records):
+                f.write(address.encode("ascii").ljust(width, b"\0"))
+                f.write(_INDEX.pack(records[address]))
+        os.replace(temporary, path)
+
+    def close(self) -> None:
+        """Unmaps the file the index was loaded from, if any.
+
+        The index can not be used afterwards.
+        """
+        if self._file is not None:
+            self._file.close()
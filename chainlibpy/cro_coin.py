@@ -1,11 +1,13 @@
 import decimal
-from typing import Dict, Union
+from typing import TYPE_CHECKING, Dict, Union
 
-from chainlibpy.generated.common import SingleCoin
-from chainlibpy.grpc_client import NetworkConfig
+from chainlibpy.network_config import NetworkConfig
 
 from .utils import is_integer
 
+if TYPE_CHECKING:
+    from chainlibpy.generated.common import SingleCoin
+
 MAX_CRO_SUPPLY = 30_000_000_000  # max CRO supply: 30 billion
 
 
@@ -176,6 +178,9 @@ class CROCoin:
     @property
     def single_coin(self) -> "SingleCoin":
         """Returns DeFi Wallet Core representation."""
+        # Imported here so that amount handling does not need the native bindings.
+        from chainlibpy.generated.common import SingleCoin
+
         return SingleCoin.OTHER(self.amount_base, self._base_denom)
 
     @property
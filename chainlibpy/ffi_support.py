@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Runtime support for the generated bindings in `chainlibpy.generated.common`.
+
+`generate_bindings.sh` regenerates that module with uniffi-bindgen, so the
+changes to its runtime live here instead, and `install()` patches them into
+the module when `chainlibpy.generated` is imported:
+
+- RustBuffers are read through a memoryview and written with one memmove,
+  and values are encoded in memory first so that their RustBuffer is
+  allocated at its exact size.
+- Byte sequences are lifted as `bytes` and lowered in one block.
+- Each thread reuses one RustCallStatus for all of its FFI calls.
+- Native objects are freed by `close()`, a `with` block or a
+  `weakref.finalize` callback, and counted in `native_handle_stats`.
+
+Two changes can not be made at runtime, so `generate_bindings.sh` applies
+them to the generated module with `generated_bindings.patch`: the native
+library is loaded through a `LazyLibrary`, which has to happen while the
+module is imported, and byte arguments are passed on as they are, instead
+of being copied into a list of ints first.
+"""
+
+import contextlib
+import ctypes
+import re
+import struct
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# The generated bindings module, set by `install()`.
+_bindings: Any = None
+
+_CALL_SUCCESS = 0
+_CALL_ERROR = 1
+_CALL_PANIC = 2
+
+# Pre-compiled big-endian codecs for the fixed-width primitives, so the format strings are
+# parsed once at import rather than on every read.
+_STRUCT_I8 = struct.Struct(">b")
+_STRUCT_U8 = struct.Struct(">B")
+_STRUCT_I16 = struct.Struct(">h")
+_STRUCT_U16 = struct.Struct(">H")
+_STRUCT_I32 = struct.Struct(">i")
+_STRUCT_U32 = struct.Struct(">I")
+_STRUCT_I64 = struct.Struct(">q")
+_STRUCT_U64 = struct.Struct(">Q")
+_STRUCT_FLOAT = struct.Struct(">f")
+_STRUCT_DOUBLE = struct.Struct(">d")
+
+
+class _SignatureRecorder:
+    # Stands in for a symbol while the bindings are imported, keeping its argtypes and restype.
+    _signature: Dict[str, Any]
+
+    def __init__(self, signature: Dict[str, Any]) -> None:
+        object.__setattr__(self, "_signature", signature)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._signature[name] = value
+
+
+class LazyLibrary:
+    """Stand-in for the native library of the generated bindings, which
+    defers the work they do at import time.
+
+    While the bindings are imported, the `argtypes` and `restype` they set
+    on each symbol are recorded. Once `install()` ends the recording, the
+    shared library is only loaded when the first symbol is looked up, and
+    each symbol gets its recorded signature the first time it is used.
+    Bound symbols are cached on the instance, so later lookups are plain
+    attribute reads.
+
+    Args:
+        load (Callable[[], ctypes.CDLL]): loads the shared library
+    """
+
+    def __init__(self, load: Callable[[], ctypes.CDLL]) -> None:
+        self._load = load
+        self._lib: Optional[ctypes.CDLL] = None
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, Dict[str, Any]] = {}
+        self._recording = True
+
+    @property
+    def symbols(self) -> Tuple[str, ...]:
+        """Names of the symbols the bindings declared."""
+        return tuple(self._signatures)
+
+    def stop_recording(self) -> None:
+        self._recording = False
+
+    def is_loaded(self) -> bool:
+        return self._lib is not None
+
+    def load(self) -> ctypes.CDLL:
+        with self._lock:
+            if self._lib is None:
+                self._lib = self._load()
+        return self._lib
+
+    def bind_all(self) -> None:
+        """Resolves every symbol up front, e.g. before forking workers that
+        should not pay for it."""
+        for name in self._signatures:
+            getattr(self, name)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._recording:
+            return _SignatureRecorder(self._signatures.setdefault(name, {}))
+        fn = getattr(self._lib or self.load(), name)
+        for attr, value in self._signatures.get(name, {}).items():
+            setattr(fn, attr, value)
+        setattr(self, name, fn)
+        return fn
+
+
+class RustBufferStream(object):
+    """Helper for structured reading of bytes from a RustBuffer.
+
+    The buffer contents are wrapped once in a memoryview over the rust-owned memory, so reads
+    unpack in place instead of slicing out a temporary copy. The view is only valid until the
+    RustBuffer is freed, which `RustBuffer.consumeWithStream` does once reading is done.
+    """
+
+    def __init__(self, rbuf: Any) -> None:
+        self.rbuf = rbuf
+        self.offset = 0
+        self._len = rbuf.len
+        if self._len > 0:
+            address = ctypes.cast(rbuf.data, ctypes.c_void_p).value
+            self._view = memoryview((ctypes.c_ubyte * self._len).from_address(address))
+        else:
+            self._view = memoryview(b"")
+
+    def remaining(self) -> int:
+        return self._len - self.offset
+
+    def _unpack_from(self, size: int, unpacker: struct.Struct) -> Any:
+        offset = self.offset
+        if offset + size > self._len:
+            raise _bindings.InternalError("read past end of rust buffer")
+        value = unpacker.unpack_from(self._view, offset)[0]
+        self.offset = offset + size
+        return value
+
+    def unpack(self, unpacker: struct.Struct) -> Tuple[Any, ...]:
+        """Reads a fixed-width run of values described by a pre-compiled
+        `struct.Struct`."""
+        offset = self.offset
+        if offset + unpacker.size > self._len:
+            raise _bindings.InternalError("read past end of rust buffer")
+        values = unpacker.unpack_from(self._view, offset)
+        self.offset = offset + unpacker.size
+        return values
+
+    def read(self, size: int) -> bytes:
+        offset = self.offset
+        if offset + size > self._len:
+            raise _bindings.InternalError("read past end of rust buffer")
+        data = self._view[offset : offset + size].tobytes()
+        self.offset = offset + size
+        return data
+
+    def readI8(self) -> int:
+        return self._unpack_from(1, _STRUCT_I8)
+
+    def readU8(self) -> int:
+        return self._unpack_from(1, _STRUCT_U8)
+
+    def readI16(self) -> int:
+        return self._unpack_from(2, _STRUCT_I16)
+
+    def readU16(self) -> int:
+        return self._unpack_from(2, _STRUCT_U16)
+
+    def readI32(self) -> int:
+        return self._unpack_from(4, _STRUCT_I32)
+
+    def readU32(self) -> int:
+        return self._unpack_from(4, _STRUCT_U32)
+
+    def readI64(self) -> int:
+        return self._unpack_from(8, _STRUCT_I64)
+
+    def readU64(self) -> int:
+        return self._unpack_from(8, _STRUCT_U64)
+
+    def readFloat(self) -> float:
+        return self._unpack_from(4, _STRUCT_FLOAT)
+
+    def readDouble(self) -> float:
+        return self._unpack_from(8, _STRUCT_DOUBLE)
+
+
+class _Writer(object):
+    """Mixin adding the typed writes of the generated RustBufferBuilder.
+
+    Subclasses must provide `write(value)`, appending the given bytes.
+    """
+
+    write: Callable[[bytes], None]
+
+    def writeI8(self, v: int) -> None:
+        self.write(_STRUCT_I8.pack(v))
+
+    def writeU8(self, v: int) -> None:
+        self.write(_STRUCT_U8.pack(v))
+
+    def writeI16(self, v: int) -> None:
+        self.write(_STRUCT_I16.pack(v))
+
+    def writeU16(self, v: int) -> None:
+        self.write(_STRUCT_U16.pack(v))
+
+    def writeI32(self, v: int) -> None:
+        self.write(_STRUCT_I32.pack(v))
+
+    def writeU32(self, v: int) -> None:
+        self.write(_STRUCT_U32.pack(v))
+
+    def writeI64(self, v: int) -> None:
+        self.write(_STRUCT_I64.pack(v))
+
+    def writeU64(self, v: int) -> None:
+        self.write(_STRUCT_U64.pack(v))
+
+    def writeFloat(self, v: float) -> None:
+        self.write(_STRUCT_FLOAT.pack(v))
+
+    def writeDouble(self, v: float) -> None:
+        self.write(_STRUCT_DOUBLE.pack(v))
+
+
+class RustBufferBuilder(_Writer):
+    """Helper for structured writing of bytes into a RustBuffer.
+
+    Args:
+        size (int): initial capacity of the buffer. Pass the exact encoded
+            size when it is known, so that the buffer never has to grow.
+    """
+
+    def __init__(self, size: int = 16) -> None:
+        self.rbuf = _bindings.RustBuffer.alloc(size)
+        self.rbuf.len = 0
+        self._address = ctypes.cast(self.rbuf.data, ctypes.c_void_p).value
+
+    def finalize(self) -> Any:
+        rbuf = self.rbuf
+        self.rbuf = None
+        return rbuf
+
+    def discard(self) -> None:
+        if self.rbuf is not None:
+            rbuf = self.finalize()
+            rbuf.free()
+
+    def _reserve(self, numBytes: int) -> int:
+        # Make room for `numBytes` more bytes and return the address they should be copied to.
+        # The data pointer only moves when rust reallocates, so we cache its address between calls.
+        rbuf = self.rbuf
+        if rbuf.len + numBytes > rbuf.capacity:
+            rbuf = self.rbuf = _bindings.RustBuffer.reserve(rbuf, numBytes)
+            self._address = ctypes.cast(rbuf.data, ctypes.c_void_p).value
+        return self._address + rbuf.len
+
+    def write(self, value: Any) -> None:
+        # Copy the whole byte string with a single memmove rather than assigning it byte by byte.
+        if not isinstance(value, bytes):
+            value = bytes(value)
+        size = len(value)
+        if size == 0:
+            return
+        ctypes.memmove(self._reserve(size), value, size)
+        self.rbuf.len += size
+
+
+class RustBufferEncoder(bytearray, _Writer):
+    """In-memory stand-in for RustBufferBuilder, so that a value can be
+    encoded once and then copied into a RustBuffer allocated at its exact
+    size.
+
+    It also counts how many times a builder starting from the default 16
+    bytes would have had to call `RustBuffer.reserve` for the same writes,
+    assuming rust's amortized doubling, so that lowering can report the FFI
+    round-trips it saved.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.growths = 0
+        self._capacity = 16
+
+    def write(self, value: Any) -> None:
+        self.extend(value)
+        if len(self) > self._capacity:
+            self._capacity = max(self._capacity * 2, len(self))
+            self.growths += 1
+
+
+class RustBufferStats(object):
+    """Debug counters for the RustBuffers allocated and grown from python.
+
+    `reserves_avoided` counts the `RustBuffer.reserve` calls a default-sized
+    builder would have made for the values lowered with an exact-size
+    allocation. The counters are not synchronised, so treat them as
+    approximate when several threads lower values concurrently.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.allocs = 0
+        self.reserves = 0
+        self.reserves_avoided = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "allocs": self.allocs,
+            "reserves": self.reserves,
+            "reserves_avoided": self.reserves_avoided,
+        }
+
+
+rust_buffer_stats = RustBufferStats()
+
+
+# Each thread reuses one RustCallStatus, and the byref() pointing at it, for all of its calls.
+# Rust only writes to the status when a call fails, so it is reset in place after every failure.
+_call_status_local = threading.local()
+
+
+def _call_status() -> Tuple[Any, Any]:
+    try:
+        return _call_status_local.status, _call_status_local.ref
+    except AttributeError:
+        status = _bindings.RustCallStatus(
+            code=_CALL_SUCCESS, error_buf=_bindings.RustBuffer(0, 0, None)
+        )
+        ref = ctypes.byref(status)
+        _call_status_local.status = status
+        _call_status_local.ref = ref
+        return status, ref
+
+
+def rust_call(fn: Any, *args: Any) -> Any:
+    """Calls a rust function."""
+    status, ref = _call_status()
+    result = fn(*args, ref)
+    if status.code == _CALL_SUCCESS:
+        return result
+    _raise_call_error(None, status)
+
+
+def rust_call_with_error(error_ffi_converter: Any, fn: Any, *args: Any) -> Any:
+    """Calls a rust function which returns a `Result`, raising its error
+    lifted with `error_ffi_converter`."""
+    status, ref = _call_status()
+    result = fn(*args, ref)
+    if status.code == _CALL_SUCCESS:
+        return result
+    _raise_call_error(error_ffi_converter, status)
+
+
+def _raise_call_error(error_ffi_converter: Any, status: Any) -> None:
+    # Take the error out of the reused status, so that it is clean for the thread's next call.
+    code = status.code
+    error_buf = _bindings.RustBuffer.from_buffer_copy(status.error_buf)
+    status.code = _CALL_SUCCESS
+    status.error_buf = _bindings.RustBuffer(0, 0, None)
+
+    if code == _CALL_ERROR:
+        if error_ffi_converter is None:
+            error_buf.free()
+            raise _bindings.InternalError(
+                "rust_call_with_error: CALL_ERROR, but error_ffi_converter is None"
+            )
+        raise error_ffi_converter.lift(error_buf)
+    if code == _CALL_PANIC:
+        # When the rust code sees a panic, it tries to construct a RustBuffer with the message.
+        # But if that code panics, then it just sends back an empty buffer.
+        if error_buf.len > 0:
+            msg = _bindings.FfiConverterString.lift(error_buf)
+        else:
+            msg = "Unknown rust panic"
+        raise _bindings.InternalError(msg)
+    raise _bindings.InternalError("Invalid RustCallStatus code: {}".format(code))
+
+
+class NativeHandleStats(object):
+    """Debug counter of the rust objects currently owned by python, by type.
+
+    Handles are counted when an object receives its pointer and uncounted
+    when the pointer is freed, so the counts staying flat over a long run
+    shows that nothing is leaking.
+    """
+
+    def __init__(self) -> None:
+        # Finalizers may run from the garbage collector while the lock is held on the same thread.
+        self._lock = threading.RLock()
+        self._live: Dict[str, int] = {}
+
+    def _add(self, type_name: str) -> None:
+        with self._lock:
+            self._live[type_name] = self._live.get(type_name, 0) + 1
+
+    def _remove(self, type_name: str) -> None:
+        with self._lock:
+            self._live[type_name] -= 1
+
+    def live(self, type_name: Optional[str] = None) -> int:
+        with self._lock:
+            if type_name is not None:
+                return self._live.get(type_name, 0)
+            return sum(self._live.values())
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {name: count for name, count in self._live.items() if count}
+
+
+native_handle_stats = NativeHandleStats()
+
+
+def _free_native_handle(free_symbol: str, type_name: str, pointer: int) -> None:
+    native_handle_stats._remove(type_name)
+    _bindings.rust_call(getattr(_bindings._UniFFILib, free_symbol), pointer)
+
+
+class NativeObject(object):
+    """Members given to the generated classes which own a pointer to rust
+    memory, in place of their `__del__`.
+
+    The pointer is freed by `close()`, by leaving a `with` block, or by a
+    `weakref.finalize` callback once the object is unreachable, whichever
+    comes first. Unlike `__del__`, the finalizer also runs for objects
+    caught in reference cycles and at interpreter exit.
+    """
+
+    # Name of the `..._object_free` FFI function of the class.
+    _free_symbol = ""
+
+    @property
+    def _pointer(self) -> Any:
+        pointer = self.__dict__.get("_native_pointer")
+        if pointer is None:
+            raise _bindings.InternalError("{} has been closed".format(type(self).__name__))
+        return pointer
+
+    @_pointer.setter
+    def _pointer(self, pointer: Any) -> None:
+        type_name = type(self).__name__
+        native_handle_stats._add(type_name)
+        self._native_pointer = pointer
+        self._finalizer = weakref.finalize(
+            self, _free_native_handle, self._free_symbol, type_name, pointer
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self.__dict__.get("_native_pointer") is None
+
+    def close(self) -> None:
+        finalizer = self.__dict__.get("_finalizer")
+        if finalizer is not None:
+            # A finalizer runs at most once, so closing twice is harmless.
+            finalizer()
+        self._native_pointer = None
+
+    def __enter__(self) -> Any:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+_NATIVE_OBJECT_MEMBERS = ["_pointer", "closed", "close", "__enter__", "__exit__"]
+
+# Matches the free functions of the objects, e.g. "ffi_common_ad00_HDWallet_object_free".
+_OBJECT_FREE = re.compile(r"ffi_[a-z0-9]+_[a-z0-9]+_(\w+)_object_free")
+
+
+def _install_native_objects(common: Any) -> None:
+    # Object classes are named after the interfaces of the UDL file, in another case, e.g.
+    # HdWallet for HDWallet.
+    free_symbols = {}
+    for symbol in common._UniFFILib.symbols:
+        match = _OBJECT_FREE.fullmatch(symbol)
+        if match is not None:
+            free_symbols[match.group(1).lower()] = symbol
+    for name, value in vars(common).items():
+        free_symbol = free_symbols.get(name.lower())
+        if free_symbol is None or not isinstance(value, type) or "__del__" not in vars(value):
+            continue
+        delattr(value, "__del__")
+        for member in _NATIVE_OBJECT_MEMBERS:
+            setattr(value, member, vars(NativeObject)[member])
+        setattr(value, "_free_symbol", free_symbol)
+
+
+def _install_rust_buffer(common: Any) -> None:
+    alloc = common.RustBuffer.alloc
+    reserve = common.RustBuffer.reserve
+
+    def counted_alloc(size: int) -> Any:
+        rust_buffer_stats.allocs += 1
+        return alloc(size)
+
+    def counted_reserve(rbuf: Any, additional: int) -> Any:
+        rust_buffer_stats.reserves += 1
+        return reserve(rbuf, additional)
+
+    @contextlib.contextmanager
+    def allocWithBuilder(size: int = 16) -> Iterator[RustBufferBuilder]:
+        """Context-manager to allocate a buffer using a RustBufferBuilder.
+
+        The allocated buffer will be automatically freed if an error occurs, ensuring that we
+        don't accidentally leak it. Pass the exact encoded size when it is known, so that the
+        builder never has to grow the buffer.
+        """
+        builder = common.RustBufferBuilder(size)
+        try:
+            yield builder
+        except BaseException:
+            builder.discard()
+            raise
+
+    common.RustBuffer.alloc = staticmethod(counted_alloc)
+    common.RustBuffer.reserve = staticmethod(counted_reserve)
+    common.RustBuffer.allocWithBuilder = allocWithBuilder
+
+
+def _rust_buffer_lower(cls: Any, value: Any) -> Any:
+    # Encode into memory first so that the buffer is allocated once at its exact size.
+    encoder = RustBufferEncoder()
+    cls.write(value, encoder)
+    with _bindings.RustBuffer.allocWithBuilder(len(encoder)) as builder:
+        builder.write(encoder)
+        rust_buffer_stats.reserves_avoided += encoder.growths
+        return builder.finalize()
+
+
+def _rust_buffer_size_of(cls: Any, value: Any) -> int:
+    encoder = RustBufferEncoder()
+    cls.write(value, encoder)
+    return len(encoder)
+
+
+def _string_lower(value: str) -> Any:
+    utf8_bytes = value.encode("utf-8")
+    with _bindings.RustBuffer.allocWithBuilder(len(utf8_bytes)) as builder:
+        builder.write(utf8_bytes)
+        if len(utf8_bytes) > 16:
+            rust_buffer_stats.reserves_avoided += 1
+        return builder.finalize()
+
+
+def _string_size_of(value: str) -> int:
+    # Size when written as a field of another value: a length prefix plus the UTF-8 bytes.
+    return 4 + len(value.encode("utf-8"))
+
+
+# Byte sequences are lifted as `bytes` and lowered from any bytes-like value (or iterable of
+# ints), moving the length prefix plus one contiguous block instead of one item at a time.
+def _bytes_write(cls: Any, value: Any, buf: Any) -> None:
+    if isinstance(value, int):
+        raise TypeError("Expected a bytes-like value, int found")
+    value = bytes(value)
+    buf.writeI32(len(value))
+    buf.write(value)
+
+
+def _bytes_read(cls: Any, buf: Any) -> bytes:
+    count = buf.readI32()
+    if count < 0:
+        raise _bindings.InternalError("Unexpected negative sequence length")
+    return buf.read(count)
+
+
+def _fixed_size(size: int) -> Any:
+    return staticmethod(lambda value: size)
+
+
+def _install_converters(common: Any) -> None:
+    common.FfiConverterRustBuffer.lower = classmethod(_rust_buffer_lower)
+    common.FfiConverterRustBuffer.size_of = classmethod(_rust_buffer_size_of)
+    common.FfiConverterString.lower = staticmethod(_string_lower)
+    common.FfiConverterString.size_of = staticmethod(_string_size_of)
+    common.FfiConverterSequenceUInt8.write = classmethod(_bytes_write)
+    common.FfiConverterSequenceUInt8.read = classmethod(_bytes_read)
+    for name, size in [
+        ("FfiConverterUInt8", 1),
+        ("FfiConverterUInt32", 4),
+        ("FfiConverterUInt64", 8),
+        ("FfiConverterInt64", 8),
+        ("FfiConverterBool", 1),
+    ]:
+        getattr(common, name).size_of = _fixed_size(size)
+
+
+def install(common: Any) -> None:
+    """Patches the runtime support into the generated bindings module.
+
+    Called once, by `chainlibpy.generated` when it imports the bindings.
+    """
+    global _bindings
+    if _bindings is not None:
+        return
+    _bindings = common
+    common._UniFFILib.stop_recording()
+    common.RustBufferStream = RustBufferStream
+    common.RustBufferBuilder = RustBufferBuilder
+    common.rust_call = rust_call
+    common.rust_call_with_error = rust_call_with_error
+    _install_rust_buffer(common)
+    _install_converters(common)
+    _install_native_objects(common)
@@ -0,0 +1,423 @@
+"""Fused codecs for the generated records on the signing and query hot path.
+
+The generated `FfiConverterType*` classes encode a record one field at a
+time, and every primitive goes through its own converter call, reserve check
+and `struct.pack`. The codecs here produce exactly the same bytes, but pack
+runs of fixed-width fields with a single pre-compiled `struct.Struct` and
+hand each record to the `RustBufferBuilder` in one write. Lowering encodes a
+value once and allocates its RustBuffer at exactly the encoded size.
+
+`install()` swaps the fused codecs into the generated converters. It is
+called when `chainlibpy.wallet` or `chainlibpy.grpc_client` is imported.
+Variants without a fused codec fall back to the generated implementation.
+"""
+
+import struct
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from chainlibpy import ffi_support
+from chainlibpy.generated import common
+from chainlibpy.generated.common import (
+    CosmosSdkMsg,
+    CosmosSdkTxInfo,
+    InternalError,
+    Network,
+    RawRpcAccountStatus,
+    RawRpcBalance,
+    SingleCoin,
+    TxBroadcastResult,
+)
+
+_I32 = struct.Struct(">i")
+_U32 = struct.Struct(">I")
+_U64 = struct.Struct(">Q")
+_I32_U64 = struct.Struct(">iQ")
+_U64_U64 = struct.Struct(">QQ")
+_U64_U64_U64 = struct.Struct(">QQQ")
+
+_NONE = b"\x00"
+_SOME = b"\x01"
+
+# Enum variant tags, as assigned by the generated converters.
+_NETWORK_TAGS = {
+    Network.CRYPTO_ORG_MAINNET: 1,
+    Network.CRYPTO_ORG_TESTNET: 2,
+    Network.CRONOS_MAINNET: 3,
+    Network.COSMOS_HUB: 4,
+}
+_NETWORK_VARIANTS = {tag: variant for variant, tag in _NETWORK_TAGS.items()}
+_NETWORK_OTHER_TAG = 5
+
+# SingleCoin variants which carry nothing but a u64 amount.
+_SINGLE_COIN_TAGS = {
+    SingleCoin.BASE_CRO: 1,
+    SingleCoin.TESTNET_BASE_CRO: 3,
+    SingleCoin.TESTNET_CRO: 4,
+    SingleCoin.UATOM: 5,
+    SingleCoin.ATOM: 6,
+}
+_SINGLE_COIN_VARIANTS = {tag: variant for variant, tag in _SINGLE_COIN_TAGS.items()}
+_SINGLE_COIN_CRO_TAG = 2
+_SINGLE_COIN_OTHER_TAG = 7
+
+_BANK_SEND_TAG = 1
+
+
+_CONVERTER_NAMES = [
+    "FfiConverterTypeNetwork",
+    "FfiConverterTypeSingleCoin",
+    "FfiConverterTypeCosmosSdkTxInfo",
+    "FfiConverterTypeCosmosSdkMsg",
+    "FfiConverterSequenceTypeCosmosSdkMsg",
+    "FfiConverterTypeRawRpcAccountStatus",
+    "FfiConverterTypeRawRpcBalance",
+    "FfiConverterTypeTxBroadcastResult",
+]
+
+_PATCHED_ATTRIBUTES = ["read", "write", "lower", "size_of"]
+
+# The generated attributes, exactly as found in each converter class (`None` when inherited).
+_GENERIC: Dict[str, Dict[str, Any]] = {
+    name: {attr: vars(getattr(common, name)).get(attr) for attr in _PATCHED_ATTRIBUTES}
+    for name in _CONVERTER_NAMES
+}
+
+
+def _generic_read(name: str, buf: Any) -> Any:
+    return _GENERIC[name]["read"].__get__(None, getattr(common, name))(buf)
+
+
+def _generic_encode(name: str, value: Any) -> bytes:
+    encoder = ffi_support.RustBufferEncoder()
+    _GENERIC[name]["write"].__get__(None, getattr(common, name))(value, encoder)
+    return bytes(encoder)
+
+
+def encode_string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return _I32.pack(len(data)) + data
+
+
+def encode_network(network: Network) -> bytes:
+    tag = _NETWORK_TAGS.get(type(network))
+    if tag is not None:
+        return _I32.pack(tag)
+    if type(network) is Network.OTHER:
+        return b"".join(
+            (
+                _I32.pack(_NETWORK_OTHER_TAG),
+                encode_string(network.chain_id),
+                _U32.pack(network.coin_type),
+                encode_string(network.bech32hrp),
+            )
+        )
+    return _generic_encode("FfiConverterTypeNetwork", network)
+
+
+def encode_single_coin(coin: SingleCoin) -> bytes:
+    tag = _SINGLE_COIN_TAGS.get(type(coin))
+    if tag is not None:
+        return _I32_U64.pack(tag, coin.amount)
+    if type(coin) is SingleCoin.OTHER:
+        return (
+            _I32.pack(_SINGLE_COIN_OTHER_TAG)
+            + encode_string(coin.amount)
+            + encode_string(coin.denom)
+        )
+    if type(coin) is SingleCoin.CRO:
+        return _I32_U64.pack(_SINGLE_COIN_CRO_TAG, coin.amount) + encode_network(coin.network)
+    return _generic_encode("FfiConverterTypeSingleCoin", coin)
+
+
+def encode_tx_info(
+    tx_info: CosmosSdkTxInfo,
+    encode_fee: Callable[[SingleCoin], bytes] = encode_single_coin,
+    encode_tx_network: Callable[[Network], bytes] = encode_network,
+) -> bytes:
+    memo = tx_info.memo_note
+    return b"".join(
+        (
+            _U64_U64_U64.pack(tx_info.account_number, tx_info.sequence_number, tx_info.gas_limit),
+            encode_fee(tx_info.fee_amount),
+            _U32.pack(tx_info.timeout_height),
+            _NONE if memo is None else _SOME + encode_string(memo),
+            encode_tx_network(tx_info.network),
+        )
+    )
+
+
+def split_tx_info(tx_info: CosmosSdkTxInfo) -> Tuple[bytes, bytes]:
+    """Encodes `tx_info` around its sequence number.
+
+    Returns:
+        Tuple[bytes, bytes]: prefix and suffix such that `prefix +
+        encode_sequence(n) + suffix` is the encoding of `tx_info` with
+        sequence number n
+    """
+    data = encode_tx_info(tx_info)
+    return data[: _U64.size], data[2 * _U64.size :]
+
+
+encode_sequence = _U64.pack
+
+
+class TxInfoEncoder:
+    """Encodes the `CosmosSdkTxInfo` records of a batch of transactions.
+
+    The transactions of a batch usually share their fee and network objects,
+    so the encoding of each is kept, by identity, and reused. Those objects
+    must not be modified while the encoder is in use.
+    """
+
+    MAX_CACHED = 64
+
+    def __init__(self) -> None:
+        self._cache: Dict[int, Tuple[Any, bytes]] = {}
+        self._encode_fee = lambda fee: self._encoded(fee, encode_single_coin)
+        self._encode_network = lambda network: self._encoded(network, encode_network)
+
+    def _encoded(self, value: Any, encode: Callable[[Any], bytes]) -> bytes:
+        cached = self._cache.get(id(value))
+        # The value is kept alongside its encoding, so its id can not be reused meanwhile.
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        if len(self._cache) >= self.MAX_CACHED:
+            self._cache.clear()
+        data = encode(value)
+        self._cache[id(value)] = (value, data)
+        return data
+
+    def encode(self, tx_info: CosmosSdkTxInfo) -> bytes:
+        return encode_tx_info(tx_info, self._encode_fee, self._encode_network)
+
+
+def encode_msg(msg: CosmosSdkMsg) -> bytes:
+    if type(msg) is CosmosSdkMsg.BANK_SEND:
+        return (
+            _I32.pack(_BANK_SEND_TAG)
+            + encode_string(msg.recipient_address)
+            + encode_single_coin(msg.amount)
+        )
+    return _generic_encode("FfiConverterTypeCosmosSdkMsg", msg)
+
+
+def encode_msgs(msgs: List[CosmosSdkMsg]) -> bytes:
+    return _I32.pack(len(msgs)) + b"".join([encode_msg(msg) for msg in msgs])
+
+
+def encode_account_status(account: RawRpcAccountStatus) -> bytes:
+    pub_key = account.pub_key
+    return b"".join(
+        (
+            encode_string(account.account_type),
+            encode_string(account.address),
+            _NONE
+            if pub_key is None
+            else _SOME + encode_string(pub_key.pub_key_type) + encode_string(pub_key.key),
+            _U64_U64.pack(account.account_number, account.sequence),
+        )
+    )
+
+
+def encode_balance(balance: RawRpcBalance) -> bytes:
+    return encode_string(balance.denom) + encode_string(balance.amount)
+
+
+def encode_broadcast_result(result: TxBroadcastResult) -> bytes:
+    return encode_string(result.tx_hash_hex) + _U32.pack(result.code) + encode_string(result.log)
+
+
+def _read_string(buf: Any) -> str:
+    size = buf.readI32()
+    if size < 0:
+        raise InternalError("Unexpected negative string length")
+    return buf.read(size).decode("utf-8")
+
+
+def _read_optional_flag(buf: Any) -> bool:
+    flag = buf.readU8()
+    if flag == 0:
+        return False
+    elif flag == 1:
+        return True
+    raise InternalError("Unexpected flag byte for optional type")
+
+
+def _read_network(buf: Any) -> Network:
+    tag = buf.readI32()
+    variant = _NETWORK_VARIANTS.get(tag)
+    if variant is not None:
+        return variant()
+    if tag == _NETWORK_OTHER_TAG:
+        return Network.OTHER(_read_string(buf), buf.readU32(), _read_string(buf))
+    raise InternalError("Raw enum value doesn't match any cases")
+
+
+def _read_single_coin(buf: Any) -> SingleCoin:
+    tag = buf.readI32()
+    variant = _SINGLE_COIN_VARIANTS.get(tag)
+    if variant is not None:
+        return variant(buf.readU64())
+    if tag == _SINGLE_COIN_OTHER_TAG:
+        return SingleCoin.OTHER(_read_string(buf), _read_string(buf))
+    if tag == _SINGLE_COIN_CRO_TAG:
+        return SingleCoin.CRO(buf.readU64(), _read_network(buf))
+    raise InternalError("Raw enum value doesn't match any cases")
+
+
+def _read_tx_info(buf: Any) -> CosmosSdkTxInfo:
+    account_number, sequence_number, gas_limit = buf.unpack(_U64_U64_U64)
+    return CosmosSdkTxInfo(
+        account_number=account_number,
+        sequence_number=sequence_number,
+        gas_limit=gas_limit,
+        fee_amount=_read_single_coin(buf),
+        timeout_height=buf.readU32(),
+        memo_note=_read_string(buf) if _read_optional_flag(buf) else None,
+        network=_read_network(buf),
+    )
+
+
+def _read_msg(buf: Any) -> CosmosSdkMsg:
+    if buf.readI32() == _BANK_SEND_TAG:
+        return CosmosSdkMsg.BANK_SEND(_read_string(buf), _read_single_coin(buf))
+    # Not fused: rewind the variant tag and let the generated converter decode it.
+    buf.offset -= _I32.size
+    return _generic_read("FfiConverterTypeCosmosSdkMsg", buf)
+
+
+def _read_msgs(buf: Any) -> List[CosmosSdkMsg]:
+    count = buf.readI32()
+    if count < 0:
+        raise InternalError("Unexpected negative sequence length")
+    return [_read_msg(buf) for _ in range(count)]
+
+
+def _read_account_status(buf: Any) -> RawRpcAccountStatus:
+    account_type = _read_string(buf)
+    address = _read_string(buf)
+    pub_key = common.FfiConverterOptionalTypeRawRpcPubKey.read(buf)
+    account_number, sequence = buf.unpack(_U64_U64)
+    return RawRpcAccountStatus(
+        account_type=account_type,
+        address=address,
+        pub_key=pub_key,
+        account_number=account_number,
+        sequence=sequence,
+    )
+
+
+def _read_balance(buf: Any) -> RawRpcBalance:
+    return RawRpcBalance(denom=_read_string(buf), amount=_read_string(buf))
+
+
+def _read_broadcast_result(buf: Any) -> TxBroadcastResult:
+    return TxBroadcastResult(
+        tx_hash_hex=_read_string(buf), code=buf.readU32(), log=_read_string(buf)
+    )
+
+
+def lower_encoded(data: bytes) -> common.RustBuffer:
+    """Lowers an already encoded value into a RustBuffer of exactly its size."""
+    with common.RustBuffer.allocWithBuilder(len(data)) as builder:  # type: ignore
+        builder.write(data)
+        # A default-sized builder would have grown once to take the whole record.
+        ffi_support.rust_buffer_stats.reserves_avoided += len(data) > 16
+        return builder.finalize()
+
+
+def build_signed_msg_tx_encoded(
+    tx_info: bytes, msgs: bytes, secret_key: common.SecretKey
+) -> bytes:
+    """`build_signed_msg_tx` taking the transaction info and messages as
+    encoded by `encode_tx_info()` and `encode_msgs()`."""
+    return common.FfiConverterSequenceUInt8.lift(
+        common.rust_call_with_error(
+            common.FfiConverterTypeCosmosError,
+            common._UniFFILib.common_ad00_build_signed_msg_tx,
+            lower_encoded(tx_info),
+            lower_encoded(msgs),
+            common.FfiConverterTypeSecretKey.lower(secret_key),
+        )
+    )
+
+
+def _fused_methods(read: Callable[[Any], Any], encode: Callable[[Any], bytes]) -> Dict[str, Any]:
+    def write(value: Any, buf: Any) -> None:
+        buf.write(encode(value))
+
+    def lower(value: Any) -> Any:
+        return lower_encoded(encode(value))
+
+    def size_of(value: Any) -> int:
+        return len(encode(value))
+
+    return {
+        "read": staticmethod(read),
+        "write": staticmethod(write),
+        "lower": staticmethod(lower),
+        "size_of": staticmethod(size_of),
+    }
+
+
+_FUSED: Dict[str, Dict[str, Any]] = {
+    "FfiConverterTypeNetwork": _fused_methods(_read_network, encode_network),
+    "FfiConverterTypeSingleCoin": _fused_methods(_read_single_coin, encode_single_coin),
+    "FfiConverterTypeCosmosSdkTxInfo": _fused_methods(_read_tx_info, encode_tx_info),
+    "FfiConverterTypeCosmosSdkMsg": _fused_methods(_read_msg, encode_msg),
+    "FfiConverterSequenceTypeCosmosSdkMsg": _fused_methods(_read_msgs, encode_msgs),
+    "FfiConverterTypeRawRpcAccountStatus": _fused_methods(
+        _read_account_status, encode_account_status
+    ),
+    "FfiConverterTypeRawRpcBalance": _fused_methods(_read_balance, encode_balance),
+    "FfiConverterTypeTxBroadcastResult": _fused_methods(
+        _read_broadcast_result, encode_broadcast_result
+    ),
+}
+
+_installed = False
+
+
+def _set_attributes(attributes: Dict[str, Dict[str, Any]]) -> None:
+    for name, methods in attributes.items():
+        converter = getattr(common, name)
+        for attr, method in methods.items():
+            if method is not None:
+                setattr(converter, attr, method)
+            elif attr in vars(converter):
+                delattr(converter, attr)
+
+
+def install() -> None:
+    """Makes the generated converters use the fused codecs.
+
+    Safe to call more than once: converters are only replaced when the
+    fused codecs are not installed yet, so wrappers added on top of them,
+    e.g. by `chainlibpy.profiling`, are kept.
+    """
+    global _installed
+    if _installed:
+        return
+    _set_attributes(_FUSED)
+    _installed = True
+
+
+def uninstall() -> None:
+    """Restores the generated converter implementations."""
+    global _installed
+    _set_attributes(_GENERIC)
+    _installed = False
+
+
+@contextmanager
+def generic_codecs() -> Iterator[None]:
+    """Temporarily uses the generated codecs, e.g. to compare their output
+    with the fused ones."""
+    was_installed = _installed
+    uninstall()
+    try:
+        yield
+    finally:
+        if was_installed:
+            install()
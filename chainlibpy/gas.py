@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from chainlibpy.generated.common import CosmosSdkMsg
+
+DEFAULT_GAS_ADJUSTMENT = 1.3
+DEFAULT_GAS_ESTIMATE_TTL = 600.0
+
+# Number of messages of each variant, e.g. (("BANK_SEND", 3),).
+MessageShape = Tuple[Tuple[str, int], ...]
+
+
+def message_shape(msgs: Iterable[CosmosSdkMsg]) -> MessageShape:
+    """Returns the variants of `msgs` and how many messages there are of
+    each, which transactions with similar gas usage have in common."""
+    # Variant classes are named like "CosmosSdkMsg.BANK_SEND".
+    variants = Counter(type(msg).__name__.rpartition(".")[2] for msg in msgs)
+    return tuple(sorted(variants.items()))
+
+
+class GasEstimator:
+    """Caches the gas used by simulated transactions, by message shape.
+
+    Transactions with the same number of messages of each variant use
+    about the same gas, so one simulation per shape is enough until the
+    estimate expires.
+
+    Args:
+        ttl (float): seconds an estimate is kept for. Defaults to
+            DEFAULT_GAS_ESTIMATE_TTL.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_GAS_ESTIMATE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._estimates: Dict[MessageShape, Tuple[int, float]] = {}
+
+    def gas_used(self, shape: MessageShape, simulate: Callable[[], int]) -> int:
+        """Returns the gas used by transactions of `shape`.
+
+        Args:
+            shape (MessageShape): shape of the transaction, see `message_shape()`
+            simulate (Callable[[], int]): simulates the transaction and returns
+                the gas it used, called when there is no unexpired estimate
+
+        Returns:
+            int: gas used by the simulated transaction
+        """
+        now = self._clock()
+        with self._lock:
+            cached = self._estimates.get(shape)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        gas_used = simulate()
+        with self._lock:
+            self._estimates[shape] = (gas_used, self._clock() + self._ttl)
+        return gas_used
+
+    def invalidate(self, shape: Optional[MessageShape] = None) -> None:
+        """Drops the estimate of `shape`, or all of them."""
+        with self._lock:
+            if shape is None:
+                self._estimates.clear()
+            else:
+                self._estimates.pop(shape, None)
@@ -0,0 +1,6 @@
+# common.py is regenerated by generate_bindings.sh, so its runtime support is kept in
+# chainlibpy.ffi_support and patched in here, before anything else uses the bindings.
+from chainlibpy import ffi_support
+from chainlibpy.generated import common
+
+ffi_support.install(common)
@@ -343,7 +343,8 @@ def loadIndirect():
 # A ctypes library to expose the extern-C FFI definitions.
 # This is an implementation detail which will be called internally by the public API.
 
-_UniFFILib = loadIndirect()
+from chainlibpy.ffi_support import LazyLibrary
+_UniFFILib = LazyLibrary(loadIndirect)
 _UniFFILib.ffi_common_ad00_WalletCoinFunc_object_free.argtypes = (
     ctypes.c_void_p,
     ctypes.POINTER(RustCallStatus),
@@ -1227,7 +1228,6 @@ class CosmosSdkClient(object):
     
 
     def broadcast_tx(self, raw_signed_tx,mode):
-        raw_signed_tx = list(int(x) for x in raw_signed_tx)
         
         mode = (None if mode is None else mode)
         
@@ -1265,7 +1265,6 @@ class CosmosSdkClient(object):
         FfiConverterString.lower(denom))
         )
     def simulate(self, raw_signed_tx):
-        raw_signed_tx = list(int(x) for x in raw_signed_tx)
         
         return FfiConverterUInt64.lift(
             rust_call_with_error(
@@ -1505,7 +1504,6 @@ class FfiConverterTypeEthSigner:
 
 class HdWallet(object):
     def __init__(self, seed_val):
-        seed_val = list(int(x) for x in seed_val)
         
         self._pointer = rust_call_with_error(FfiConverterTypeHdWrapError,_UniFFILib.common_ad00_HDWallet_new,
         FfiConverterSequenceUInt8.lower(seed_val))
@@ -1639,7 +1637,6 @@ class SecretKey(object):
 
     @classmethod
     def from_bytes(cls, bytes):
-        bytes = list(int(x) for x in bytes)
         
         # Call the (fallible) function before creating any half-baked object instances.
         pointer = rust_call_with_error(FfiConverterTypeSecretKeyWrapError,_UniFFILib.common_ad00_SecretKey_from_bytes,
@@ -6852,7 +6849,6 @@ def get_account_balance_blocking(api_url,address,denom,version):
 def simulate_blocking(grpc_url,raw_signed_tx):
     grpc_url = grpc_url
     
-    raw_signed_tx = list(int(x) for x in raw_signed_tx)
     
     return FfiConverterUInt64.lift(rust_call_with_error(FfiConverterTypeRestError,_UniFFILib.common_ad00_simulate_blocking,
         FfiConverterString.lower(grpc_url),
@@ -6863,7 +6859,6 @@ def simulate_blocking(grpc_url,raw_signed_tx):
 def broadcast_tx_sync_blocking(tendermint_rpc_url,raw_signed_tx):
     tendermint_rpc_url = tendermint_rpc_url
     
-    raw_signed_tx = list(int(x) for x in raw_signed_tx)
     
     return FfiConverterTypeTxBroadcastResult.lift(rust_call_with_error(FfiConverterTypeRestError,_UniFFILib.common_ad00_broadcast_tx_sync_blocking,
         FfiConverterString.lower(tendermint_rpc_url),
@@ -6931,7 +6926,6 @@ def get_contract_balance_blocking(account_address,contract_details,web3api_url):
 
 
 def broadcast_eth_signed_raw_tx_blocking(raw_tx,web3api_url,polling_interval_ms):
-    raw_tx = list(int(x) for x in raw_tx)
     
     web3api_url = web3api_url
     
@@ -7028,7 +7022,6 @@ def broadcast_contract_batch_transfer_tx_blocking(batch_transfer_details,network
 
 
 def bytes_to_hex(data):
-    data = list(int(x) for x in data)
     
     return FfiConverterString.lift(rust_call(_UniFFILib.common_ad00_bytes_to_hex,
         FfiConverterSequenceUInt8.lower(data)))
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from dataclasses import dataclass
+from types import TracebackType
+from typing import Optional, Type
 
+from chainlibpy import fused_codecs
+from chainlibpy.gas import GasEstimator
 from chainlibpy.generated.common import (
     BalanceApiVersion,
     CosmosSdkClient,
@@ -12,45 +15,10 @@ from chainlibpy.generated.common import (
     TxBroadcastMode,
     TxBroadcastResult,
 )
+from chainlibpy.network_config import CRO_NETWORK, NetworkConfig  # noqa: F401
 
+fused_codecs.install()
 
-@dataclass
-class NetworkConfig:
-    grpc_endpoint: str
-    tendermint_rpc: str
-    rest_api: str
-    chain_id: str
-    address_prefix: str
-    coin_denom: str
-    coin_base_denom: str
-    exponent: int
-    derivation_path: str
-
-
-CRO_NETWORK = {
-    "mainnet": NetworkConfig(
-        grpc_endpoint="https://mainnet.crypto.org:9090",
-        tendermint_rpc="https://mainnet.crypto.org:443",
-        rest_api="https://mainnet.crypto.org:1317",
-        chain_id="crypto-org-chain-mainnet-1",
-        address_prefix="cro",
-        coin_denom="cro",
-        coin_base_denom="basecro",
-        exponent=8,
-        derivation_path="m/44'/394'/0'/0/0",
-    ),
-    "testnet_croeseid": NetworkConfig(
-        grpc_endpoint="https://testnet-croeseid-4.crypto.org:9090",
-        tendermint_rpc="https://testnet-croeseid-4.crypto.org:443",
-        rest_api="https://testnet-croeseid-4.crypto.org:1317",
-        chain_id="testnet-croeseid-4",
-        address_prefix="tcro",
-        coin_denom="tcro",
-        coin_base_denom="basetcro",
-        exponent=8,
-        derivation_path="m/44'/1'/0'/0/0",
-    ),
-}
 
 DEFAULT_MODE = TxBroadcastMode.COMMIT()
 
@@ -65,6 +33,8 @@ class GrpcClient:
         self.client = CosmosSdkClient(
             network.tendermint_rpc, network.rest_api, BalanceApiVersion.NEW, network.grpc_endpoint
         )
+        # Shared by the transactions estimating their gas limit with this client.
+        self.gas_estimator = GasEstimator()
 
     def query_bank_denom_metadata(self, denom: str) -> DenomMetadata:
         """Queries metadata of a given coin denomination.
@@ -114,6 +84,17 @@ class GrpcClient:
             raise TypeError("Error response: {}".format(account_response))
         return account_response.account
 
+    def simulate(self, tx_byte: bytes) -> int:
+        """Simulates the execution of a signed transaction.
+
+        Args:
+            tx_byte (bytes): raw signed transaction
+
+        Returns:
+            int: gas used by the transaction
+        """
+        return self.client.simulate(tx_byte)
+
     def broadcast_transaction(
         self, tx_byte: bytes, mode: TxBroadcastMode = DEFAULT_MODE
     ) -> TxBroadcastResult:
@@ -133,3 +114,23 @@ class GrpcClient:
             BroadcastTxResponse: a subset of cosmos.tx.v1beta1.service_pb2.BroadcastTxResponse
         """
         return self.client.broadcast_tx(tx_byte, mode)
+
+    def close(self) -> None:
+        """Frees the native client.
+
+        The client can not be used afterwards. Closing is optional, the
+        native memory is otherwise freed once the client is garbage
+        collected.
+        """
+        self.client.close()
+
+    def __enter__(self) -> "GrpcClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import hmac
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from chainlibpy.utils.types import PathLike
+
+DEFAULT_SCRYPT_N = 2**14
+DEFAULT_SCRYPT_R = 8
+DEFAULT_SCRYPT_P = 1
+
+# File layout: header, nonce, ciphertext and a HMAC-SHA256 tag over all of them. The
+# ciphertext is the JSON encoded entries, XORed with a HMAC-SHA256 keystream in counter mode.
+_MAGIC = b"CLPYKC01"
+_HEADER = struct.Struct(">8s16sIII")  # magic, scrypt salt, scrypt n, r and p
+_NONCE_SIZE = 16
+_TAG_SIZE = 32
+_COUNTER = struct.Struct(">Q")
+# Bounds of the scrypt parameters read from a cache file, which are used before the MAC can
+# authenticate them. Without them, a crafted file could make scrypt allocate any amount of memory.
+_MAX_SCRYPT_MEMORY = 2**30
+_MAX_SCRYPT_P = 16
+
+
+class CachedKey(NamedTuple):
+    secret_key: bytes
+    public_key: bytes
+    address: str
+
+
+class KeyCache:
+    """Encrypted file caching the keys and addresses derived for wallets, so
+    that they can be loaded without recovering the mnemonic seeds again.
+
+    Entries are stored by (mnemonic fingerprint, derivation path, hrp). The
+    fingerprint is keyed by the passphrase, so it does not reveal which
+    mnemonic an entry belongs to. The file is encrypted and authenticated
+    with keys derived from the passphrase with scrypt, and read once when
+    the cache is opened.
+
+    Args:
+        path (str): cache file. It is created by `save()` if it does not exist.
+        passphrase (str, bytes): passphrase the cache is encrypted with
+        n (int): scrypt cost of a new cache file. Defaults to DEFAULT_SCRYPT_N.
+        r (int): scrypt block size of a new cache file. Defaults to DEFAULT_SCRYPT_R.
+        p (int): scrypt parallelism of a new cache file. Defaults to DEFAULT_SCRYPT_P.
+
+    Raises:
+        ValueError: the file is not a key cache, has unsupported scrypt
+            parameters, was tampered with, or the passphrase is wrong
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        passphrase: Union[str, bytes],
+        n: int = DEFAULT_SCRYPT_N,
+        r: int = DEFAULT_SCRYPT_R,
+        p: int = DEFAULT_SCRYPT_P,
+    ) -> None:
+        if isinstance(passphrase, str):
+            passphrase = passphrase.encode("utf-8")
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CachedKey] = {}
+        self._dirty = False
+
+        try:
+            data = self._path.read_bytes()
+        except FileNotFoundError:
+            self._header = _HEADER.pack(_MAGIC, os.urandom(16), n, r, p)
+            self._keys = _derive_keys(passphrase, self._header)
+        else:
+            self._header = self._read_header(data)
+            self._keys = _derive_keys(passphrase, self._header)
+            self._entries = self._decrypt(data)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _entry_id(self, seed: str, path: str, hrp: str) -> str:
+        _, _, fingerprint_key = self._keys
+        fingerprint = hmac.new(fingerprint_key, seed.encode("utf-8"), hashlib.sha256)
+        return json.dumps([fingerprint.hexdigest(), path, hrp])
+
+    def get(self, seed: str, path: str, hrp: str) -> Optional[CachedKey]:
+        """Returns the cached key of a wallet, or None if it is not cached."""
+        with self._lock:
+            return self._entries.get(self._entry_id(seed, path, hrp))
+
+    def put(
+        self,
+        seed: str,
+        path: str,
+        hrp: str,
+        secret_key: bytes,
+        public_key: bytes,
+        address: str,
+    ) -> None:
+        """Caches the key of a wallet. Call `save()` to write it to the file."""
+        entry = CachedKey(secret_key, public_key, address)
+        with self._lock:
+            self._entries[self._entry_id(seed, path, hrp)] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        """Encrypts the entries and replaces the cache file with them
+        atomically.
+
+        Does nothing if nothing was added since the file was read.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            plaintext = json.dumps(
+                {
+                    entry_id: [entry.secret_key.hex(), entry.public_key.hex(), entry.address]
+                    for entry_id, entry in self._entries.items()
+                }
+            ).encode("utf-8")
+            self._dirty = False
+
+        try:
+            encryption_key, mac_key, _ = self._keys
+            nonce = os.urandom(_NONCE_SIZE)
+            data = self._header + nonce + _xor_keystream(encryption_key, nonce, plaintext)
+            data += hmac.new(mac_key, data, hashlib.sha256).digest()
+
+            temporary = self._path.with_name(self._path.name + ".tmp")
+            # Only the owner may read the keys.
+            fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temporary, self._path)
+        except BaseException:
+            # Not written: the next save() has to try again.
+            with self._lock:
+                self._dirty = True
+            raise
+
+    def _read_header(self, data: bytes) -> bytes:
+        if data[: len(_MAGIC)] != _MAGIC or len(data) < _HEADER.size + _NONCE_SIZE + _TAG_SIZE:
+            raise ValueError(f"{self._path} is not a key cache file")
+        header = data[: _HEADER.size]
+        _, _, n, r, p = _HEADER.unpack(header)
+        if (
+            n < 2
+            or n & (n - 1)
+            or not 1 <= r <= _MAX_SCRYPT_MEMORY // (128 * n)
+            or not 1 <= p <= _MAX_SCRYPT_P
+        ):
+            raise ValueError(f"{self._path} has unsupported scrypt parameters")
+        return header
+
+    def _decrypt(self, data: bytes) -> Dict[str, CachedKey]:
+        encryption_key, mac_key, _ = self._keys
+        body, tag = data[:-_TAG_SIZE], data[-_TAG_SIZE:]
+        if not hmac.compare_digest(hmac.new(mac_key, body, hashlib.sha256).digest(), tag):
+            raise ValueError(f"wrong passphrase for {self._path}, or the file was modified")
+
+        nonce = body[_HEADER.size : _HEADER.size + _NONCE_SIZE]
+        plaintext = _xor_keystream(encryption_key, nonce, body[_HEADER.size + _NONCE_SIZE :])
+        return {
+            entry_id: CachedKey(bytes.fromhex(secret_key), bytes.fromhex(public_key), address)
+            for entry_id, (secret_key, public_key, address) in json.loads(plaintext).items()
+        }
+
+
+def _derive_keys(passphrase: bytes, header: bytes) -> Tuple[bytes, bytes, bytes]:
+    # One scrypt run gives the encryption, MAC and fingerprint keys.
+    _, salt, n, r, p = _HEADER.unpack(header)
+    keys = hashlib.scrypt(passphrase, salt=salt, n=n, r=r, p=p, maxmem=256 * n * r, dklen=96)
+    return keys[:32], keys[32:64], keys[64:]
+
+
+def _xor_keystream(key: bytes, nonce: bytes, data: bytes) -> bytes:
+    blocks = (len(data) + 31) // 32
+    keystream = b"".join(
+        hmac.new(key, nonce + _COUNTER.pack(counter), hashlib.sha256).digest()
+        for counter in range(blocks)
+    )
+    return (int.from_bytes(data, "big") ^ int.from_bytes(keystream[: len(data)], "big")).to_bytes(
+        len(data), "big"
+    )
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from dataclasses import dataclass
+
+
+@dataclass
+class NetworkConfig:
+    grpc_endpoint: str
+    tendermint_rpc: str
+    rest_api: str
+    chain_id: str
+    address_prefix: str
+    coin_denom: str
+    coin_base_denom: str
+    exponent: int
+    derivation_path: str
+
+
+CRO_NETWORK = {
+    "mainnet": NetworkConfig(
+        grpc_endpoint="https://mainnet.crypto.org:9090",
+        tendermint_rpc="https://mainnet.crypto.org:443",
+        rest_api="https://mainnet.crypto.org:1317",
+        chain_id="crypto-org-chain-mainnet-1",
+        address_prefix="cro",
+        coin_denom="cro",
+        coin_base_denom="basecro",
+        exponent=8,
+        derivation_path="m/44'/394'/0'/0/0",
+    ),
+    "testnet_croeseid": NetworkConfig(
+        grpc_endpoint="https://testnet-croeseid-4.crypto.org:9090",
+        tendermint_rpc="https://testnet-croeseid-4.crypto.org:443",
+        rest_api="https://testnet-croeseid-4.crypto.org:1317",
+        chain_id="testnet-croeseid-4",
+        address_prefix="tcro",
+        coin_denom="tcro",
+        coin_base_denom="basetcro",
+        exponent=8,
+        derivation_path="m/44'/1'/0'/0/0",
+    ),
+}
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Bulk signing of transactions on a host with no network access.
+
+`sign_jsonl()` reads one unsigned transaction spec per line of a JSON Lines
+file, for example:
+
+    {"id": "payout-1", "chain_id": "crypto-org-chain-mainnet-1",
+     "account_number": 1, "sequence": 5,
+     "msgs": [{"type": "BANK_SEND", "recipient_address": "cro1...",
+               "amount": {"amount": "1000", "denom": "basecro"}}],
+     "fee": {"amount": "5000", "denom": "basecro"}, "gas_limit": 200000,
+     "memo": "", "timeout_height": 0}
+
+and writes `{"id": "payout-1", "tx_bytes": "<base64>"}` lines with the
+signed transactions, in the same order. `id` is optional and copied as is.
+
+A message has the `type` of a `CosmosSdkMsg` variant, and its fields by
+name. Coins are written as `{"amount": ..., "denom": ...}`, like
+`CROCoin.amino_coin_message`. `fee`, `gas_limit`, `memo` and
+`timeout_height` are optional.
+"""
+
+import base64
+import json
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+from chainlibpy.generated.common import (
+    CosmosSdkMsg,
+    CosmosSdkTxInfo,
+    Network,
+    SingleCoin,
+)
+from chainlibpy.transaction import DEFAULT_GAS_LIMIT, ZERO_COIN
+from chainlibpy.utils.types import PathLike
+from chainlibpy.wallet import Wallet
+
+
+class TxSpecParser:
+    """Converts unsigned transaction specs to the arguments of
+    `Wallet.sign_tx()`.
+
+    Networks and fees are reused across specs which have the same ones, so
+    that `Wallet.sign_txs()` only encodes them once.
+    """
+
+    def __init__(self) -> None:
+        self._networks: Dict[str, Network] = {}
+        self._fees: Dict[Tuple[str, str], SingleCoin] = {}
+
+    def parse(self, spec: Dict[str, Any]) -> Tuple[CosmosSdkTxInfo, List[CosmosSdkMsg]]:
+        """Returns the transaction information and messages of a spec.
+
+        Raises:
+            ValueError: the spec is invalid
+        """
+        try:
+            chain_id = spec["chain_id"]
+            network = self._networks.get(chain_id)
+            if network is None:
+                network = self._networks[chain_id] = Network.OTHER(chain_id, 394, "cro")
+            tx_info = CosmosSdkTxInfo(
+                int(spec["account_number"]),
+                int(spec["sequence"]),
+                int(spec.get("gas_limit", DEFAULT_GAS_LIMIT)),
+                self._fee(spec.get("fee")),
+                int(spec.get("timeout_height", 0)),
+                spec.get("memo", ""),
+                network,
+            )
+            msgs = [_msg(msg) for msg in spec["msgs"]]
+        except (AttributeError, KeyError, TypeError) as error:
+            raise ValueError(f"invalid transaction spec: {error!r}") from error
+        return tx_info, msgs
+
+    def _fee(self, fee: Any) -> SingleCoin:
+        if fee is None:
+            return ZERO_COIN
+        key = (str(fee["amount"]), fee["denom"])
+        coin = self._fees.get(key)
+        if coin is None:
+            coin = self._fees[key] = SingleCoin.OTHER(*key)
+        return coin
+
+
+def _value(value: Any) -> Any:
+    if isinstance(value, dict) and value.keys() == {"amount", "denom"}:
+        return SingleCoin.OTHER(str(value["amount"]), value["denom"])
+    if isinstance(value, list):
+        return [_value(item) for item in value]
+    return value
+
+
+def _msg(spec: Dict[str, Any]) -> CosmosSdkMsg:
+    fields = dict(spec)
+    name = fields.pop("type")
+    variant = getattr(CosmosSdkMsg, name, None) if name.isupper() else None
+    if not isinstance(variant, type):
+        raise ValueError(f"unknown message type {name!r}")
+    return variant(**{field: _value(value) for field, value in fields.items()})
+
+
+def sign_jsonl(
+    wallet: Wallet, input_path: PathLike, output_path: PathLike, workers: int = 1
+) -> int:
+    """Signs every transaction spec of a JSON Lines file, see the module
+    documentation for the formats.
+
+    Both files are streamed, and signing makes no network call, so signing
+    throughput is bounded by the CPU.
+
+    Args:
+        wallet (Wallet): wallet signing the transactions
+        input_path (str): JSON Lines file of unsigned transaction specs
+        output_path (str): JSON Lines file to write the signed transactions to
+        workers (int): number of signing threads, see `Wallet.sign_txs()`.
+            Defaults to 1.
+
+    Raises:
+        ValueError: a spec is invalid, with its line number
+
+    Returns:
+        int: number of transactions signed
+    """
+    parser = TxSpecParser()
+    ids: Deque[Any] = deque()
+
+    with open(input_path, encoding="utf-8") as source, open(
+        output_path, "w", encoding="utf-8"
+    ) as output:
+
+        def specs() -> Iterator[Tuple[CosmosSdkTxInfo, List[CosmosSdkMsg]]]:
+            for line_number, line in enumerate(source, 1):
+                if not line.strip():
+                    continue
+                try:
+                    spec = json.loads(line)
+                    tx = parser.parse(spec)
+                except ValueError as error:
+                    raise ValueError(f"{input_path}:{line_number}: {error}") from error
+                ids.append(spec.get("id"))
+                yield tx
+
+        count = 0
+        for signed_tx in wallet.sign_txs(specs(), workers):
+            row = {"tx_bytes": base64.b64encode(signed_tx).decode("ascii")}
+            tx_id = ids.popleft()
+            if tx_id is not None:
+                row = {"id": tx_id, **row}
+            output.write(json.dumps(row) + "\n")
+            count += 1
+    return count
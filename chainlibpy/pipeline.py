@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Iterable, Iterator, List, Optional
+
+from chainlibpy.generated.common import (
+    CosmosSdkMsg,
+    CosmosSdkTxInfo,
+    Network,
+    SingleCoin,
+    TxBroadcastMode,
+    TxBroadcastResult,
+)
+from chainlibpy.grpc_client import GrpcClient
+from chainlibpy.sequence_manager import expected_sequence, is_sequence_mismatch
+from chainlibpy.transaction import DEFAULT_GAS_LIMIT, ZERO_COIN
+from chainlibpy.wallet import Wallet
+
+DEFAULT_WINDOW = 50
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_STALL_TIMEOUT = 30.0
+
+# Cosmos SDK error code of sdkerrors.ErrTxInMempoolCache: the transaction was already accepted.
+TX_IN_MEMPOOL_CACHE_CODE = 19
+_ACCEPTED_CODES = (0, TX_IN_MEMPOOL_CACHE_CODE)
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of one transaction submitted by a `TxPipeline`.
+
+    A transaction is either included in a block, or was rejected when
+    broadcast, in which case `code` and `log` are the broadcast error.
+    Inclusion does not mean that the messages were executed successfully,
+    look the transaction up by `tx_hash` for its execution result.
+    """
+
+    msgs: List[CosmosSdkMsg]
+    sequence: int
+    tx_hash: str
+    code: int = 0
+    log: str = ""
+
+    @property
+    def included(self) -> bool:
+        return self.code == 0
+
+
+@dataclass
+class _PendingTx:
+    msgs: List[CosmosSdkMsg]
+    sequence: int
+    tx_hash: str
+
+
+class TxPipeline:
+    """Submits many transactions from one account without waiting for each
+    of them to be included in a block.
+
+    Transactions are signed with consecutive sequences and broadcast in
+    SYNC mode, up to `window` of them in flight. Their inclusion is
+    confirmed by polling the account sequence on chain, which counts the
+    included transactions. When a transaction is rejected or dropped, the
+    transactions after it are signed again from its sequence.
+
+    The pipeline assumes no other transaction is sent from the account
+    while it is submitting.
+
+    Args:
+        client (GrpcClient): client of the node to broadcast to
+        wallet (Wallet): wallet signing the transactions
+        chain_id (str, optional): chain id. Defaults to the chain id of `client`.
+        window (int): maximum number of broadcast transactions not confirmed
+            yet. Defaults to DEFAULT_WINDOW.
+        gas_limit (int): gas limit of every transaction. Defaults to
+            DEFAULT_GAS_LIMIT.
+        fee (SingleCoin): fee of every transaction. Defaults to zero CRO.
+        memo (str): memo of every transaction. Defaults to "".
+        poll_interval (float): seconds to wait between polls of the account
+            sequence which found no newly included transaction. Defaults to
+            DEFAULT_POLL_INTERVAL.
+        stall_timeout (float): seconds without any newly included
+            transaction after which the pending transactions are assumed to
+            have been dropped from the mempool, and are broadcast again.
+            Defaults to DEFAULT_STALL_TIMEOUT.
+    """
+
+    def __init__(
+        self,
+        client: GrpcClient,
+        wallet: Wallet,
+        chain_id: Optional[str] = None,
+        window: int = DEFAULT_WINDOW,
+        gas_limit: int = DEFAULT_GAS_LIMIT,
+        fee: SingleCoin = ZERO_COIN,
+        memo: str = "",
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        stall_timeout: float = DEFAULT_STALL_TIMEOUT,
+    ) -> None:
+        if window < 1:
+            raise ValueError(f"window should be at least 1, got {window}")
+        self._client = client
+        self._wallet = wallet
+        self._chain_id = chain_id if chain_id is not None else client.chain_id
+        self._window = window
+        self._gas_limit = gas_limit
+        self._fee = fee
+        self._memo = memo
+        self._poll_interval = poll_interval
+        self._stall_timeout = stall_timeout
+
+    def submit(self, msg_lists: Iterable[List[CosmosSdkMsg]]) -> Iterator[PipelineResult]:
+        """Signs, broadcasts and confirms a transaction for each list of
+        messages.
+
+        Args:
+            msg_lists (Iterable[List[CosmosSdkMsg]]): messages of each
+                transaction. It can be a generator, it is consumed as room
+                is made in the window.
+
+        Returns:
+            Iterator[PipelineResult]: a result per transaction, yielded as
+            soon as it is included or rejected. Included transactions are
+            yielded in sequence order.
+        """
+        submission = _Submission(self, msg_lists)
+        while True:
+            yield from submission.fill_window()
+            if not submission.pending:
+                if submission.done:
+                    return
+                continue
+            yield from submission.confirm()
+
+
+class _Submission:
+    """State of one `TxPipeline.submit()` call."""
+
+    def __init__(self, pipeline: TxPipeline, msg_lists: Iterable[List[CosmosSdkMsg]]) -> None:
+        self._pipeline = pipeline
+        self._client = pipeline._client
+        self._wallet = pipeline._wallet
+        self._address = pipeline._wallet.address
+        account = self._client.query_account(self._address)
+        self._tx_info = CosmosSdkTxInfo(
+            account.account_number,
+            account.sequence,
+            pipeline._gas_limit,
+            pipeline._fee,
+            0,
+            pipeline._memo,
+            Network.OTHER(pipeline._chain_id, 394, "cro"),
+        )
+        self._next_sequence = account.sequence
+        self.pending: Deque[_PendingTx] = deque()
+        # Messages to sign again, before the ones not signed yet.
+        self._retry: Deque[List[CosmosSdkMsg]] = deque()
+        self._sources = iter(msg_lists)
+        self._exhausted = False
+        self._last_progress = time.monotonic()
+
+    @property
+    def done(self) -> bool:
+        return self._exhausted and not self._retry and not self.pending
+
+    def _next_msgs(self) -> Optional[List[CosmosSdkMsg]]:
+        if self._retry:
+            return self._retry.popleft()
+        if not self._exhausted:
+            msgs = next(self._sources, None)
+            if msgs is not None:
+                return msgs
+            self._exhausted = True
+        return None
+
+    def fill_window(self) -> Iterator[PipelineResult]:
+        """Signs and broadcasts transactions until the window is full, and
+        yields the ones rejected."""
+        while len(self.pending) < self._pipeline._window:
+            msgs = self._next_msgs()
+            if msgs is None:
+                return
+            sequence = self._tx_info.sequence_number = self._next_sequence
+            result = self._client.broadcast_transaction(
+                self._wallet.sign_tx(self._tx_info, msgs), TxBroadcastMode.SYNC()
+            )
+            if result.code in _ACCEPTED_CODES:
+                self.pending.append(_PendingTx(msgs, sequence, result.tx_hash_hex))
+                self._next_sequence += 1
+                continue
+
+            expected = self._expected_sequence(result)
+            if expected is None or expected == sequence:
+                # Rejected for another reason: the sequence is still free.
+                yield PipelineResult(msgs, sequence, result.tx_hash_hex, result.code, result.log)
+            else:
+                self._retry.appendleft(msgs)
+                self._rewind(expected)
+
+    def confirm(self) -> Iterator[PipelineResult]:
+        """Polls the account sequence once, and yields the transactions
+        included since the last poll."""
+        chain_sequence = self._client.query_account(self._address).sequence
+        if self.pending[0].sequence < chain_sequence:
+            while self.pending and self.pending[0].sequence < chain_sequence:
+                tx = self.pending.popleft()
+                yield PipelineResult(tx.msgs, tx.sequence, tx.tx_hash)
+            self._last_progress = time.monotonic()
+        elif time.monotonic() - self._last_progress >= self._pipeline._stall_timeout:
+            # The first pending transaction was dropped, so none of the others can be
+            # included either: broadcast them all again.
+            self._rewind(chain_sequence)
+            self._last_progress = time.monotonic()
+        else:
+            time.sleep(self._pipeline._poll_interval)
+
+    def _expected_sequence(self, result: TxBroadcastResult) -> Optional[int]:
+        if not is_sequence_mismatch(result):
+            return None
+        expected = expected_sequence(result)
+        if expected is None:
+            expected = self._client.query_account(self._address).sequence
+        return expected
+
+    def _rewind(self, sequence: int) -> None:
+        # Moves the pending transactions from `sequence` on back to be signed again, in order.
+        while self.pending and self.pending[-1].sequence >= sequence:
+            self._retry.appendleft(self.pending.pop().msgs)
+        self._next_sequence = sequence
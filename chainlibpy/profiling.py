@@ -0,0 +1,302 @@
+"""Opt-in profiling of calls across the Python/Rust boundary.
+
+While a profiler is enabled, every FFI call made through the generated
+bindings is recorded under its native symbol name (for example
+`common_ad00_build_signed_msg_tx`): the number of calls, their latency, and
+the time spent lowering the arguments and lifting the result in Python.
+
+    with profiling.profile() as profiler:
+        wallet.sign_tx(tx_info, msgs)
+    print(profiler.snapshot())
+
+Profiling works by swapping timed wrappers into `chainlibpy.generated.common`
+and taking them out again when it is disabled, so the uninstrumented path
+costs nothing. Converters replaced while profiling is enabled, e.g. by
+`fused_codecs.generic_codecs()`, are not instrumented.
+"""
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from chainlibpy import fused_codecs
+from chainlibpy.generated import common
+
+# Latency percentiles are computed over the most recent calls of each symbol.
+DEFAULT_MAX_SAMPLES = 10_000
+
+_NS_PER_S = 1e9
+
+
+class _SymbolProfile:
+    def __init__(self, max_samples: int) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.lower_ns = 0
+        self.lift_ns = 0
+        self.samples: Deque[int] = deque(maxlen=max_samples)
+
+
+class Profiler:
+    """Collects per-symbol FFI statistics while enabled.
+
+    Args:
+        max_samples (int): number of recent calls per symbol kept for the
+            latency percentiles
+    """
+
+    def __init__(self, max_samples: int = DEFAULT_MAX_SAMPLES) -> None:
+        self._max_samples = max_samples
+        self._lock = threading.Lock()
+        self._symbols: Dict[str, _SymbolProfile] = {}
+
+    def reset(self) -> None:
+        """Discards everything recorded so far."""
+        with self._lock:
+            self._symbols = {}
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Returns the statistics recorded so far, by native symbol.
+
+        Returns:
+            Dict[str, Dict[str, float]]: for each symbol, `calls` and
+            `errors` counts, and `total_s`, `mean_s`, `p50_s`, `p90_s`,
+            `p99_s`, `max_s`, `lower_s` and `lift_s` timings in seconds
+        """
+        with self._lock:
+            symbols = [
+                (symbol, profile, sorted(profile.samples))
+                for symbol, profile in self._symbols.items()
+            ]
+
+        return {
+            symbol: {
+                "calls": profile.calls,
+                "errors": profile.errors,
+                "total_s": profile.total_ns / _NS_PER_S,
+                "mean_s": profile.total_ns / profile.calls / _NS_PER_S,
+                "p50_s": _percentile(samples, 50),
+                "p90_s": _percentile(samples, 90),
+                "p99_s": _percentile(samples, 99),
+                "max_s": samples[-1] / _NS_PER_S,
+                "lower_s": profile.lower_ns / _NS_PER_S,
+                "lift_s": profile.lift_ns / _NS_PER_S,
+            }
+            for symbol, profile, samples in symbols
+            if profile.calls
+        }
+
+    def _profile(self, symbol: str) -> _SymbolProfile:
+        profile = self._symbols.get(symbol)
+        if profile is None:
+            profile = self._symbols[symbol] = _SymbolProfile(self._max_samples)
+        return profile
+
+    def _record_call(self, symbol: str, elapsed_ns: int, lower_ns: int, failed: bool) -> None:
+        with self._lock:
+            profile = self._profile(symbol)
+            profile.calls += 1
+            profile.errors += failed
+            profile.total_ns += elapsed_ns
+            profile.lower_ns += lower_ns
+            profile.samples.append(elapsed_ns)
+
+    def _record_lift(self, symbol: str, elapsed_ns: int) -> None:
+        with self._lock:
+            self._profile(symbol).lift_ns += elapsed_ns
+
+
+def _percentile(samples: List[int], percent: int) -> float:
+    # Nearest-rank percentile of sorted samples.
+    index = max(0, -(-len(samples) * percent // 100) - 1)
+    return samples[index] / _NS_PER_S
+
+
+class _ThreadState(threading.local):
+    def __init__(self) -> None:
+        # Nesting depth of lower/lift calls, so that nested calls (e.g. the RustBuffer
+        # allocation made while lowering an argument) are not counted twice.
+        self.depth = 0
+        # Time spent lowering the arguments of the next FFI call.
+        self.pending_lower_ns = 0
+        # Symbol whose result is about to be lifted.
+        self.lift_symbol: Optional[str] = None
+
+
+_state = _ThreadState()
+_active: Optional[Profiler] = None
+_lock = threading.Lock()
+_originals: Dict[Tuple[Any, str], Any] = {}
+_wrappers: Dict[Tuple[Any, str], Any] = {}
+
+_rust_call_with_error = common.rust_call_with_error
+
+
+def _profiled_rust_call_with_error(error_ffi_converter: Any, fn: Any, *args: Any) -> Any:
+    profiler = _active
+    if profiler is None:
+        return _rust_call_with_error(error_ffi_converter, fn, *args)
+
+    failed = True
+    start = perf_counter_ns()
+    try:
+        result = _rust_call_with_error(error_ffi_converter, fn, *args)
+        failed = False
+        return result
+    finally:
+        elapsed_ns = perf_counter_ns() - start
+        state = _state
+        if state.depth:
+            profiler._record_call(fn.__name__, elapsed_ns, 0, failed)
+        else:
+            profiler._record_call(fn.__name__, elapsed_ns, state.pending_lower_ns, failed)
+            state.pending_lower_ns = 0
+            state.lift_symbol = None if failed else fn.__name__
+
+
+def _profiled_rust_call(fn: Any, *args: Any) -> Any:
+    return _profiled_rust_call_with_error(None, fn, *args)
+
+
+def _timed_lower(lower: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def timed(value: Any) -> Any:
+        state = _state
+        state.depth += 1
+        start = perf_counter_ns()
+        try:
+            return lower(value)
+        finally:
+            state.depth -= 1
+            if not state.depth:
+                state.pending_lower_ns += perf_counter_ns() - start
+
+    return timed
+
+
+def _timed_lift(lift: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def timed(value: Any) -> Any:
+        state = _state
+        state.depth += 1
+        start = perf_counter_ns()
+        try:
+            return lift(value)
+        finally:
+            state.depth -= 1
+            profiler = _active
+            if not state.depth and state.lift_symbol is not None and profiler is not None:
+                profiler._record_lift(state.lift_symbol, perf_counter_ns() - start)
+                state.lift_symbol = None
+
+    return timed
+
+
+def _converters() -> List[Any]:
+    return [
+        value
+        for name, value in vars(common).items()
+        if name.startswith("FfiConverter")
+        and isinstance(value, type)
+        and value not in (common.FfiConverterPrimitive, common.FfiConverterRustBuffer)
+        and hasattr(value, "lower")
+        and hasattr(value, "lift")
+    ]
+
+
+def _patch(owner: Any, attr: str, wrapper: Any) -> None:
+    _originals[(owner, attr)] = vars(owner).get(attr)
+    _wrappers[(owner, attr)] = wrapper
+    setattr(owner, attr, wrapper)
+
+
+def _instrument() -> None:
+    # The bindings install the fused codecs when first used; do it now so that they are
+    # the ones being wrapped.
+    fused_codecs.install()
+    _patch(common, "rust_call", _profiled_rust_call)
+    _patch(common, "rust_call_with_error", _profiled_rust_call_with_error)
+    for converter in _converters():
+        _patch(converter, "lower", staticmethod(_timed_lower(converter.lower)))
+        _patch(converter, "lift", staticmethod(_timed_lift(converter.lift)))
+
+
+def _uninstrument() -> None:
+    for (owner, attr), wrapper in _wrappers.items():
+        # Leave alone anything that was replaced again after it was instrumented.
+        if vars(owner).get(attr) is not wrapper:
+            continue
+        original = _originals[(owner, attr)]
+        if original is not None:
+            setattr(owner, attr, original)
+        else:
+            delattr(owner, attr)
+    _originals.clear()
+    _wrappers.clear()
+
+
+def enable(profiler: Optional[Profiler] = None) -> Profiler:
+    """Starts recording FFI calls, replacing the active profiler if any.
+
+    Args:
+        profiler (Profiler): profiler to record into. Defaults to a new one.
+
+    Returns:
+        Profiler: the active profiler
+    """
+    global _active
+    if profiler is None:
+        profiler = Profiler()
+    with _lock:
+        if _active is None:
+            _instrument()
+        _active = profiler
+    return profiler
+
+
+def disable() -> Optional[Profiler]:
+    """Stops recording FFI calls and removes the instrumentation.
+
+    Returns:
+        Optional[Profiler]: the profiler which was active, if any
+    """
+    global _active
+    with _lock:
+        profiler = _active
+        if profiler is not None:
+            _uninstrument()
+            _active = None
+    return profiler
+
+
+def is_enabled() -> bool:
+    return _active is not None
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """Returns the statistics of the active profiler, see
+    `Profiler.snapshot()`.
+
+    Returns an empty dict when profiling is disabled.
+    """
+    profiler = _active
+    return profiler.snapshot() if profiler is not None else {}
+
+
+@contextmanager
+def profile(max_samples: int = DEFAULT_MAX_SAMPLES) -> Iterator[Profiler]:
+    """Records the FFI calls made inside the `with` block into a new
+    profiler.
+
+    Whatever profiler was active before is restored on exit.
+    """
+    previous = _active
+    profiler = enable(Profiler(max_samples))
+    try:
+        yield profiler
+    finally:
+        if previous is not None:
+            enable(previous)
+        else:
+            disable()
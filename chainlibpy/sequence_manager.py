@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+from chainlibpy.generated.common import TxBroadcastResult
+
+if TYPE_CHECKING:
+    from chainlibpy.grpc_client import GrpcClient
+
+# Cosmos SDK error code of sdkerrors.ErrWrongSequence.
+SEQUENCE_MISMATCH_CODE = 32
+
+_SEQUENCE_MISMATCH = "account sequence mismatch"
+_EXPECTED_SEQUENCE = re.compile(r"expected (\d+)")
+
+
+def is_sequence_mismatch(result: TxBroadcastResult) -> bool:
+    """Whether a broadcast was rejected because its account sequence was
+    not the one expected by the chain."""
+    return result.code == SEQUENCE_MISMATCH_CODE or _SEQUENCE_MISMATCH in result.log
+
+
+def expected_sequence(result: TxBroadcastResult) -> Optional[int]:
+    """Returns the sequence the chain expected according to the log of a
+    sequence mismatch, or None if the log does not say."""
+    match = _EXPECTED_SEQUENCE.search(result.log)
+    return int(match.group(1)) if match is not None else None
+
+
+class _Account:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.account_number: Optional[int] = None
+        self.next_sequence = 0
+
+
+class SequenceManager:
+    """Hands out the account sequences of signed transactions locally.
+
+    The account number and sequence of an address are queried once, then
+    every call to `next_sequence()` returns the following sequence without
+    querying the chain. Transactions signed back-to-back from one account,
+    including from several threads, get consecutive sequences.
+
+    Pass the results of broadcasting the transactions to `update()`: after
+    a sequence mismatch, the sequence the chain expected is used from then
+    on, or queried again if the error does not say which one it is.
+
+    Args:
+        client (GrpcClient): client used to query the accounts
+    """
+
+    def __init__(self, client: "GrpcClient") -> None:
+        self._client = client
+        self._lock = threading.Lock()
+        self._accounts: Dict[str, _Account] = {}
+
+    def _account(self, address: str) -> _Account:
+        with self._lock:
+            account = self._accounts.get(address)
+            if account is None:
+                account = self._accounts[address] = _Account()
+            return account
+
+    @staticmethod
+    def _sync(account: _Account, client: "GrpcClient", address: str) -> None:
+        status = client.query_account(address)
+        account.account_number = status.account_number
+        account.next_sequence = status.sequence
+
+    def account_number(self, address: str) -> int:
+        """Returns the account number of `address`, querying it on first use."""
+        account = self._account(address)
+        with account.lock:
+            if account.account_number is None:
+                self._sync(account, self._client, address)
+            assert account.account_number is not None
+            return account.account_number
+
+    def next_sequence(self, address: str) -> int:
+        """Reserves the next sequence of `address` for a new transaction.
+
+        Returns:
+            int: sequence to sign the transaction with
+        """
+        account = self._account(address)
+        with account.lock:
+            if account.account_number is None:
+                self._sync(account, self._client, address)
+            sequence = account.next_sequence
+            account.next_sequence += 1
+            return sequence
+
+    def resync(self, address: str) -> None:
+        """Queries the account of `address` again before the next sequence is
+        handed out, e.g. after transactions were sent from another process."""
+        account = self._account(address)
+        with account.lock:
+            account.account_number = None
+
+    def update(self, address: str, result: TxBroadcastResult) -> bool:
+        """Resynchronises the sequence of `address` if a broadcast of one of
+        its transactions failed with a sequence mismatch.
+
+        Args:
+            address (str): address which signed the transaction
+            result (TxBroadcastResult): result of broadcasting it
+
+        Returns:
+            bool: whether the broadcast failed with a sequence mismatch, in
+            which case the transaction should be signed again
+        """
+        if not is_sequence_mismatch(result):
+            return False
+        expected = expected_sequence(result)
+        account = self._account(address)
+        with account.lock:
+            if expected is not None and account.account_number is not None:
+                account.next_sequence = expected
+            else:
+                account.account_number = None
+        return True
@@ -1,34 +1,52 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import math
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
-from typing import List, Optional
-
+from chainlibpy import fused_codecs
+from chainlibpy.gas import DEFAULT_GAS_ADJUSTMENT, GasEstimator, message_shape
 from chainlibpy.generated.common import (
     CosmosSdkMsg,
     CosmosSdkTxInfo,
     Network,
+    RawRpcAccountStatus,
     SingleCoin,
 )
 from chainlibpy.grpc_client import GrpcClient
+from chainlibpy.sequence_manager import SequenceManager
 from chainlibpy.wallet import Wallet
 
 DEFAULT_GAS_LIMIT = 200_000
+AUTO_GAS = "auto"
 ZERO_COIN = SingleCoin.BASE_CRO(0)
 
 
+def _auto_gas_estimator(
+    client: Optional[GrpcClient], gas_estimator: Optional[GasEstimator]
+) -> GasEstimator:
+    if client is None:
+        raise ValueError(f'a client is needed to simulate the "{AUTO_GAS}" gas_limit')
+    return gas_estimator if gas_estimator is not None else client.gas_estimator
+
+
 class Transaction:
     def __init__(
         self,
         chain_id: str,
         from_wallet: Wallet,
         msgs: List[CosmosSdkMsg],
-        account_number: int,
-        client: "GrpcClient",
-        gas_limit: int = DEFAULT_GAS_LIMIT,
+        account_number: Optional[int] = None,
+        client: Optional["GrpcClient"] = None,
+        gas_limit: Union[int, str] = DEFAULT_GAS_LIMIT,
         fee: SingleCoin = ZERO_COIN,
         memo: str = "",
         timeout_height: Optional[int] = None,
+        sequence_manager: Optional[SequenceManager] = None,
+        sequence: Optional[int] = None,
+        account: Optional[RawRpcAccountStatus] = None,
+        gas_adjustment: float = DEFAULT_GAS_ADJUSTMENT,
+        gas_estimator: Optional[GasEstimator] = None,
     ) -> None:
         """Transaction class to prepare unsigned transaction and generate
         signed transaction with signatures.
@@ -41,12 +59,16 @@ class Transaction:
 
             msgs (List[CosmosSdkMsg]): messages to be included in this transaction
 
-            account_number (int): account number of the account in state
+            account_number (int, optional): account number of the account in state.
+            Can be None with an `account` or a `sequence_manager`, which then provides it.
 
-            client (GrpcClient): GrpcClient object to connect to chain
+            client (GrpcClient, optional): GrpcClient object to connect to chain,
+            queried for the account sequence every time the transaction is signed.
+            Not needed with a `sequence_manager`, a `sequence` or an `account`.
 
-            gas_limit (int, optional): maximum gas can be used in transaction processing.
-            Defaults to DEFAULT_GAS_LIMIT.
+            gas_limit (int or "auto", optional): maximum gas can be used in transaction
+            processing. With "auto", it is the gas used by simulating the transaction with
+            `client`, times `gas_adjustment`. Defaults to DEFAULT_GAS_LIMIT.
 
             fee (SingleCoin): amount of coins to be paid as a fee.
             Defaults to zero CRO.
@@ -55,7 +77,44 @@ class Transaction:
 
             timeout_height (int, optional): this transaction will not be processed
             after timeout height. Defaults to None.
+
+            sequence_manager (SequenceManager, optional): hands out the account
+            sequence of this transaction locally, so signing it makes no network call
+            once the account is known. Defaults to None.
+
+            sequence (int, optional): account sequence to sign this transaction with,
+            so signing it makes no network call at all, e.g. on an offline host.
+            Defaults to None.
+
+            account (RawRpcAccountStatus, optional): account fetched beforehand with
+            `GrpcClient.query_account()`, providing the account number, and the
+            sequence unless `sequence` is given. Defaults to None.
+
+            gas_adjustment (float, optional): factor applied to the simulated gas with
+            an "auto" `gas_limit`, as the gas used can vary a little between
+            transactions. Defaults to DEFAULT_GAS_ADJUSTMENT.
+
+            gas_estimator (GasEstimator, optional): cache of the simulated gas by
+            message shape, used with an "auto" `gas_limit`. Defaults to the one of
+            `client`, shared by all its transactions.
         """
+        if account is not None:
+            if account_number is None:
+                account_number = account.account_number
+            if sequence is None:
+                sequence = account.sequence
+        if client is None and sequence_manager is None and sequence is None:
+            raise ValueError("either a client, a sequence_manager or a sequence is needed")
+        if account_number is None:
+            if sequence_manager is None:
+                raise ValueError("account_number is needed without an account or sequence_manager")
+            account_number = sequence_manager.account_number(from_wallet.address)
+        self._auto_gas = gas_limit == AUTO_GAS
+        if self._auto_gas:
+            gas_estimator = _auto_gas_estimator(client, gas_estimator)
+            gas_limit = DEFAULT_GAS_LIMIT
+        elif not isinstance(gas_limit, int):
+            raise ValueError(f'gas_limit should be an int or "{AUTO_GAS}", got {gas_limit!r}')
         self._chain_id = chain_id
         self._msgs = msgs
         self._fee = fee
@@ -64,7 +123,13 @@ class Transaction:
         self._timeout_height = timeout_height
         self._account_number = account_number
         self._gas_limit = gas_limit
+        self._gas_adjustment = gas_adjustment
+        self._gas_estimator = gas_estimator
         self._client = client
+        self._sequence_manager = sequence_manager
+        self._sequence = sequence
+        # Without a known sequence or a manager to reserve it, it is queried at each signing.
+        self._query_sequence = sequence is None and sequence_manager is None
         timeout = 0
         if timeout_height is not None:
             timeout = timeout_height
@@ -91,8 +156,123 @@ class Transaction:
 
         return self
 
+    @property
+    def sequence(self) -> Optional[int]:
+        """The account sequence this transaction was last signed with."""
+        return self._sequence
+
+    def reset_sequence(self) -> None:
+        """Makes the transaction reserve a new sequence from its
+        `sequence_manager` the next time it is signed, e.g. after its
+        broadcast failed with a sequence mismatch.
+
+        Does nothing without a `sequence_manager`.
+        """
+        if self._sequence_manager is not None:
+            self._sequence = None
+
     @property
     def signed_tx(self) -> bytes:
-        account = self._client.query_account(self._from_wallet.address)
-        self._tx_info.sequence_number = account.sequence
+        """The transaction signed by `from_wallet`.
+
+        With a `sequence` or an `account`, the transaction is signed with
+        that sequence. With a `sequence_manager`, the transaction reserves
+        its sequence the first time it is signed and keeps it afterwards.
+        Otherwise the sequence is queried with `client` every time.
+
+        With an "auto" `gas_limit`, the transaction is first simulated
+        unless one with the same message shape was recently.
+        """
+        if self._query_sequence:
+            assert self._client is not None
+            self._sequence = self._client.query_account(self._from_wallet.address).sequence
+        elif self._sequence is None:
+            assert self._sequence_manager is not None
+            self._sequence = self._sequence_manager.next_sequence(self._from_wallet.address)
+        self._tx_info.sequence_number = self._sequence
+        if self._auto_gas:
+            self._tx_info.gas_limit = self._estimate_gas()
         return self._from_wallet.sign_tx(self._tx_info, self._msgs)
+
+    def _estimate_gas(self) -> int:
+        def simulate() -> int:
+            assert self._client is not None
+            # Simulations do not run out of gas, any gas limit will do.
+            self._tx_info.gas_limit = DEFAULT_GAS_LIMIT
+            return self._client.simulate(self._from_wallet.sign_tx(self._tx_info, self._msgs))
+
+        assert self._gas_estimator is not None
+        gas_used = self._gas_estimator.gas_used(message_shape(self._msgs), simulate)
+        return math.ceil(gas_used * self._gas_adjustment)
+
+
+class TransactionTemplate:
+    def __init__(
+        self,
+        chain_id: str,
+        from_wallet: Wallet,
+        account_number: int,
+        gas_limit: int = DEFAULT_GAS_LIMIT,
+        fee: SingleCoin = ZERO_COIN,
+        memo: str = "",
+        timeout_height: Optional[int] = None,
+    ) -> None:
+        """Signs many transactions which only differ in their messages and
+        sequence, e.g. payouts from one account.
+
+        Everything else about the transactions (chain, account number, gas
+        limit, fee, memo and timeout height) is encoded once, when the
+        template is created. Signing a transaction then only encodes its
+        sequence and messages.
+
+        Args:
+            chain_id (str): chain id the transactions target
+
+            from_wallet (Wallet): wallet signing the transactions
+
+            account_number (int): account number of the account in state
+
+            gas_limit (int, optional): maximum gas can be used in transaction processing.
+            Defaults to DEFAULT_GAS_LIMIT.
+
+            fee (SingleCoin): amount of coins to be paid as a fee.
+            Defaults to zero CRO.
+
+            memo (str, optional): note to be added to the transactions. Defaults to "".
+
+            timeout_height (int, optional): the transactions will not be processed
+            after timeout height. Defaults to None.
+        """
+        self._from_wallet = from_wallet
+        tx_info = CosmosSdkTxInfo(
+            account_number,
+            0,
+            gas_limit,
+            fee,
+            timeout_height if timeout_height is not None else 0,
+            memo,
+            Network.OTHER(chain_id, 394, "cro"),
+        )
+        self._prefix, self._suffix = fused_codecs.split_tx_info(tx_info)
+
+    def sign(self, sequence: int, msgs: List[CosmosSdkMsg]) -> bytes:
+        """Signs a transaction of the template.
+
+        Args:
+            sequence (int): account sequence of the transaction
+            msgs (List[CosmosSdkMsg]): messages to be included in the transaction
+
+        Returns:
+            bytes: the signed transaction payload bytes
+        """
+        return fused_codecs.build_signed_msg_tx_encoded(
+            self._prefix + fused_codecs.encode_sequence(sequence) + self._suffix,
+            fused_codecs.encode_msgs(msgs),
+            self._from_wallet.secret_key,
+        )
+
+    def sign_many(self, items: Iterable[Tuple[int, List[CosmosSdkMsg]]]) -> Iterator[bytes]:
+        """Signs a transaction for each `(sequence, msgs)` pair, yielding the
+        signed payload bytes lazily, in order."""
+        for sequence, msgs in items:
+            yield self.sign(sequence, msgs)
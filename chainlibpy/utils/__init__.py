@@ -1,5 +1,10 @@
-from .types import is_integer
+from .bech32 import address_from_public_key, addresses_for_prefixes, bech32_encode
+from .types import PathLike, is_integer
 
 __all__ = [
+    "PathLike",
+    "address_from_public_key",
+    "addresses_for_prefixes",
+    "bech32_encode",
     "is_integer",
 ]
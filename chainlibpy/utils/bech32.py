@@ -0,0 +1,184 @@
+"""Bech32 (BIP 173) encoding of Cosmos SDK account addresses.
+
+An account address is the bech32 encoding of RIPEMD-160(SHA-256(public key))
+under a human-readable part (hrp) such as "cro", so it can be computed from
+a public key for any prefix without calling into the native library.
+"""
+
+import hashlib
+import struct
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence
+
+_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_GENERATOR = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+# The XOR of the generators selected by each value of the 5 bits shifted out of the checksum.
+_GENERATOR_TABLE = [
+    _GENERATOR[0] * (top & 1)
+    ^ _GENERATOR[1] * (top >> 1 & 1)
+    ^ _GENERATOR[2] * (top >> 2 & 1)
+    ^ _GENERATOR[3] * (top >> 3 & 1)
+    ^ _GENERATOR[4] * (top >> 4 & 1)
+    for top in range(32)
+]
+
+
+def _polymod(values: Iterable[int], checksum: int = 1) -> int:
+    table = _GENERATOR_TABLE
+    for value in values:
+        checksum = ((checksum & 0x1FFFFFF) << 5 ^ value) ^ table[checksum >> 25]
+    return checksum
+
+
+@lru_cache(maxsize=64)
+def _hrp_checksum(hrp: str) -> int:
+    # The checksum state after the expanded hrp, shared by every address with that prefix.
+    expanded = [ord(char) >> 5 for char in hrp] + [0] + [ord(char) & 31 for char in hrp]
+    return _polymod(expanded)
+
+
+def _to_five_bit_groups(data: bytes) -> List[int]:
+    bits = len(data) * 8
+    count = -(-bits // 5)
+    value = int.from_bytes(data, "big") << (count * 5 - bits)
+    return [(value >> shift) & 31 for shift in range(count * 5 - 5, -5, -5)]
+
+
+def bech32_encode(hrp: str, data: bytes) -> str:
+    """Encodes `data` as a bech32 string with the human-readable part `hrp`.
+
+    Args:
+        hrp (str): human-readable part, e.g. "cro"
+        data (bytes): payload, e.g. a 20-byte account address
+
+    Returns:
+        str: the bech32 string
+    """
+    if not hrp or any(not 33 <= ord(char) <= 126 for char in hrp):
+        raise ValueError(f"invalid bech32 human-readable part {hrp!r}")
+    hrp = hrp.lower()
+    groups = _to_five_bit_groups(data)
+    polymod = _polymod(groups + [0] * 6, _hrp_checksum(hrp)) ^ 1
+    groups += [(polymod >> shift) & 31 for shift in (25, 20, 15, 10, 5, 0)]
+    return hrp + "1" + "".join([_CHARSET[group] for group in groups])
+
+
+def address_from_public_key(public_key: bytes, hrp: str) -> str:
+    """Returns the Cosmos SDK account address of a compressed secp256k1
+    public key.
+
+    Args:
+        public_key (bytes): 33-byte compressed public key
+        hrp (str): bech32 human-readable part of the address, e.g. "cro"
+
+    Returns:
+        str: the bech32 account address
+    """
+    return bech32_encode(hrp, _ripemd160(hashlib.sha256(public_key).digest()))
+
+
+def addresses_for_prefixes(
+    public_keys: Iterable[bytes], hrps: Sequence[str]
+) -> Dict[str, List[str]]:
+    """Returns the addresses of many public keys under several bech32
+    prefixes.
+
+    Each public key is hashed once, whatever the number of prefixes.
+
+    Args:
+        public_keys (Iterable[bytes]): compressed public keys
+        hrps (Sequence[str]): bech32 human-readable parts, e.g. ["cro", "tcro"]
+
+    Returns:
+        Dict[str, List[str]]: for each hrp, the addresses in the order of
+        `public_keys`
+    """
+    account_ids = [_ripemd160(hashlib.sha256(key).digest()) for key in public_keys]
+    return {hrp: [bech32_encode(hrp, account_id) for account_id in account_ids] for hrp in hrps}
+
+
+def _ripemd160(data: bytes) -> bytes:
+    try:
+        return hashlib.new("ripemd160", data).digest()
+    except ValueError:
+        # OpenSSL 3 only provides RIPEMD-160 through its legacy provider.
+        return _pure_ripemd160(data)
+
+
+# Pure Python RIPEMD-160, from the reference description by Dobbertin, Bosselaers and Preneel.
+_R_LEFT = [
+    *range(16),
+    *(7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8),
+    *(3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12),
+    *(1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2),
+    *(4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13),
+]
+_R_RIGHT = [
+    *(5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12),
+    *(6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2),
+    *(15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13),
+    *(8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14),
+    *(12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11),
+]
+_S_LEFT = [
+    *(11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8),
+    *(7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12),
+    *(11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5),
+    *(11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12),
+    *(9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6),
+]
+_S_RIGHT = [
+    *(8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6),
+    *(9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11),
+    *(9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5),
+    *(15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8),
+    *(8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11),
+]
+_K_LEFT = (0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E)
+_K_RIGHT = (0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0x00000000)
+_MASK = 0xFFFFFFFF
+
+
+def _f(round_: int, x: int, y: int, z: int) -> int:
+    if round_ == 0:
+        return x ^ y ^ z
+    if round_ == 1:
+        return (x & y) | (~x & z)
+    if round_ == 2:
+        return (x | ~y) ^ z
+    if round_ == 3:
+        return (x & z) | (y & ~z)
+    return x ^ (y | ~z)
+
+
+def _rotate_left(value: int, count: int) -> int:
+    value &= _MASK
+    return ((value << count) | (value >> (32 - count))) & _MASK
+
+
+def _pure_ripemd160(data: bytes) -> bytes:
+    state = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0]
+    padded = data + b"\x80" + b"\x00" * ((55 - len(data)) % 64) + struct.pack("<Q", len(data) * 8)
+    for offset in range(0, len(padded), 64):
+        words = struct.unpack("<16I", padded[offset : offset + 64])
+        al, bl, cl, dl, el = state
+        ar, br, cr, dr, er = state
+        for j in range(80):
+            round_ = j >> 4
+            t = _rotate_left(
+                al + _f(round_, bl, cl, dl) + words[_R_LEFT[j]] + _K_LEFT[round_], _S_LEFT[j]
+            )
+            al, el, dl, cl, bl = el, dl, _rotate_left(cl, 10), bl, (t + el) & _MASK
+            t = _rotate_left(
+                ar + _f(4 - round_, br, cr, dr) + words[_R_RIGHT[j]] + _K_RIGHT[round_],
+                _S_RIGHT[j],
+            )
+            ar, er, dr, cr, br = er, dr, _rotate_left(cr, 10), br, (t + er) & _MASK
+        state = [
+            (state[1] + cl + dr) & _MASK,
+            (state[2] + dl + er) & _MASK,
+            (state[3] + el + ar) & _MASK,
+            (state[4] + al + br) & _MASK,
+            (state[0] + bl + cr) & _MASK,
+        ]
+    return struct.pack("<5I", *state)
@@ -1,4 +1,7 @@
-from typing import Any
+import os
+from typing import Any, Union
+
+PathLike = Union[str, "os.PathLike[str]"]
 
 
 def is_integer(value: Any) -> bool:
@@ -2,36 +2,349 @@
 # Modifications Copyright (c) 2021-present, Crypto.org
 # (licensed under the Apache License, Version 2.0)
 
-from typing import List
+import csv
+import json
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Type,
+    Union,
+)
 
+from chainlibpy import fused_codecs
 from chainlibpy.generated.common import (
     CosmosSdkMsg,
     CosmosSdkTxInfo,
     HdWallet,
     MnemonicWordCount,
     Network,
+    SecretKey,
     WalletCoin,
     build_signed_msg_tx,
 )
+from chainlibpy.utils.bech32 import address_from_public_key
+from chainlibpy.utils.types import PathLike
+
+if TYPE_CHECKING:
+    from chainlibpy.key_cache import KeyCache
+
+fused_codecs.install()
 
 DEFAULT_DERIVATION_PATH = "m/44'/394'/0'/0/0"
 DEFAULT_BECH32_HRP = "cro"
+DEFAULT_ADDRESS_CHUNK_SIZE = 1_000
+
+# Calls into the native library release the GIL, so the batch methods below run them in
+# thread pools.
+
+# Paths of the addresses derived by `HdWallet.get_address()`, for a coin type.
+_NATIVE_ADDRESS_PATH = re.compile(r"m/44'/(\d+)'/0'/0/\d+")
+
+# Either the coin of addresses derived by `HdWallet.get_address()`, or the path
+# prefix and hrp of addresses derived from the keys along that prefix.
+AddressDerivation = Union[WalletCoin, Tuple[str, str]]
+
+# The HD wallet recovered by each `Wallet.derive_addresses` worker process.
+_worker_wallet: Optional[HdWallet] = None
+
+
+def _init_address_worker(mnemonic: str) -> None:
+    global _worker_wallet
+    _worker_wallet = HdWallet.recover_wallet(mnemonic, password=None)
+
+
+def _iter_addresses(
+    wallet: HdWallet, derivation: AddressDerivation, indices: range
+) -> Iterator[str]:
+    if isinstance(derivation, WalletCoin):
+        for index in indices:
+            yield wallet.get_address(derivation, index)
+        return
+    prefix, hrp = derivation
+    for index in indices:
+        with wallet.get_key(f"{prefix}/{index}") as key:
+            yield address_from_public_key(key.get_public_key_bytes(), hrp)
+
+
+def _derive_address_chunk(derivation: AddressDerivation, indices: range) -> List[str]:
+    assert _worker_wallet is not None
+    return list(_iter_addresses(_worker_wallet, derivation, indices))
+
+
+def _recover_secret_key(seed: str, path: str) -> bytes:
+    with HdWallet.recover_wallet(seed, password=None) as wallet:
+        with wallet.get_key(path) as key:
+            return key.to_bytes()
+
+
+def _derive_addresses_in_processes(
+    mnemonic: str,
+    derivation: AddressDerivation,
+    indices: range,
+    workers: int,
+    chunk_size: int,
+) -> Iterator[str]:
+    chunks = [
+        indices[offset : offset + chunk_size] for offset in range(0, len(indices), chunk_size)
+    ]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_address_worker, initargs=(mnemonic,)
+    ) as executor:
+        for addresses in executor.map(_derive_address_chunk, repeat(derivation), chunks):
+            yield from addresses
 
 
 class Wallet:
     def __init__(
-        self, seed: str, path: str = DEFAULT_DERIVATION_PATH, hrp: str = DEFAULT_BECH32_HRP
+        self,
+        seed: str,
+        path: str = DEFAULT_DERIVATION_PATH,
+        hrp: str = DEFAULT_BECH32_HRP,
+        cache: Optional["KeyCache"] = None,
     ):
-        self.path = path
-        self.hrp = hrp
-        self.wallet = HdWallet.recover_wallet(seed, password=None)
+        """Recovers the wallet of a mnemonic seed.
+
+        With a `cache`, the key, public key and address are read from it if
+        it has them, and the seed is then only recovered if this wallet
+        needs to derive other keys. Otherwise they are derived and added to
+        the cache, which has to be saved by the caller.
+
+        Args:
+            seed (str): BIP39 mnemonic seed
+            path (str): derivation path. Defaults to DEFAULT_DERIVATION_PATH.
+            hrp (str): bech32 human-readable part. Defaults to DEFAULT_BECH32_HRP.
+            cache (KeyCache, optional): cache of derived keys
+        """
+        cached = cache.get(seed, path, hrp) if cache is not None else None
+        if cached is not None:
+            self._setup(
+                None, path, hrp, owns_wallet=True, key=SecretKey.from_bytes(cached.secret_key)
+            )
+            self._public_key, self._address = cached.public_key, cached.address
+            self._seed = seed
+            return
+
+        self._setup(HdWallet.recover_wallet(seed, password=None), path, hrp, owns_wallet=True)
+        if cache is not None:
+            cache.put(seed, path, hrp, self.private_key, self.public_key, self.address)
+
+    def _setup(
+        self,
+        wallet: Optional[HdWallet],
+        path: Optional[str],
+        hrp: str,
+        owns_wallet: bool,
+        key: Optional[SecretKey] = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._key = key
+        self._public_key: Optional[bytes] = None
+        self._address: Optional[str] = None
+        self._path = path
+        self._hrp = hrp
+        self._owns_wallet = owns_wallet
+        # Seed of a wallet loaded from a `KeyCache`, recovered when first needed.
+        self._seed: Optional[str] = None
+        self.wallet = wallet
 
     @classmethod
     def new(cls, path: str = DEFAULT_DERIVATION_PATH, hrp: str = DEFAULT_BECH32_HRP) -> "Wallet":
-        seed = HdWallet.generate_wallet(
+        """Creates a wallet with a new 24-word mnemonic seed.
+
+        The wallet is created from the generated HD wallet directly, the
+        seed is not recovered again from its mnemonic.
+        """
+        wallet = cls.__new__(cls)
+        hd_wallet = HdWallet.generate_wallet(
             password=None, word_count=MnemonicWordCount.TWENTY_FOUR
-        ).get_backup_mnemonic_phrase()
-        return Wallet(seed, path, hrp)
+        )
+        wallet._setup(hd_wallet, path, hrp, owns_wallet=True)
+        return wallet
+
+    @classmethod
+    def generate_many(
+        cls,
+        count: int,
+        path: str = DEFAULT_DERIVATION_PATH,
+        hrp: str = DEFAULT_BECH32_HRP,
+        workers: int = 1,
+    ) -> List["Wallet"]:
+        """Creates many wallets with new mnemonic seeds, e.g. for test
+        fixtures, see `new()`.
+
+        With more than one worker, the wallets are generated in a thread
+        pool. Use `export_wallets()` to write them out.
+
+        Args:
+            count (int): number of wallets
+            path (str): derivation path of every wallet. Defaults to
+                DEFAULT_DERIVATION_PATH.
+            hrp (str): bech32 human-readable part. Defaults to DEFAULT_BECH32_HRP.
+            workers (int): number of threads. Defaults to 1.
+
+        Returns:
+            List[Wallet]: the new wallets
+        """
+        if count < 0:
+            raise ValueError(f"count should not be negative, got {count}")
+        if workers <= 1:
+            return [cls.new(path, hrp) for _ in range(count)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda _: cls.new(path, hrp), range(count)))
+
+    @classmethod
+    def load_many(
+        cls,
+        seeds: Iterable[str],
+        path: str = DEFAULT_DERIVATION_PATH,
+        hrp: str = DEFAULT_BECH32_HRP,
+        workers: int = 1,
+        processes: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List["Wallet"]:
+        """Recovers a wallet for each of many seeds, in parallel.
+
+        By default the wallets are recovered in a thread pool. With
+        `processes=True` they are recovered in a process pool instead. The
+        worker processes then send back the derived secret keys, and the
+        returned wallets are created with `from_secret_key()`: they sign and
+        have the same address, but can not derive other keys.
+
+        Args:
+            seeds (Iterable[str]): mnemonic seeds
+            path (str): derivation path of every wallet. Defaults to
+                DEFAULT_DERIVATION_PATH.
+            hrp (str): bech32 human-readable part. Defaults to DEFAULT_BECH32_HRP.
+            workers (int): number of threads or processes. Defaults to 1.
+            processes (bool): use processes instead of threads. Defaults to False.
+            progress (Callable[[int, int], None], optional): called with the
+                number of wallets loaded so far and the total after each one
+
+        Returns:
+            List[Wallet]: the wallets, in the order of `seeds`
+        """
+        seeds = list(seeds)
+        total = len(seeds)
+        wallets: List[Wallet] = []
+
+        def loaded(wallet: Wallet) -> None:
+            wallets.append(wallet)
+            if progress is not None:
+                progress(len(wallets), total)
+
+        if processes:
+            chunksize = max(1, total // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as process_executor:
+                for secret_key in process_executor.map(
+                    _recover_secret_key, seeds, repeat(path), chunksize=chunksize
+                ):
+                    loaded(cls.from_secret_key(secret_key, hrp))
+        elif workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as thread_executor:
+                for wallet in thread_executor.map(lambda seed: cls(seed, path, hrp), seeds):
+                    loaded(wallet)
+        else:
+            for seed in seeds:
+                loaded(cls(seed, path, hrp))
+        return wallets
+
+    @classmethod
+    def from_secret_key(
+        cls, secret_key: Union[SecretKey, bytes, str], hrp: str = DEFAULT_BECH32_HRP
+    ) -> "Wallet":
+        """Creates a wallet from a secret key instead of a mnemonic seed.
+
+        This skips recovering the seed, which is by far the slowest part of
+        creating a wallet. `sign_tx`, `public_key` and `address` give the same
+        results as for the wallet the key was derived from, but there is no
+        HD wallet to derive other keys or addresses from, and `path` is None.
+
+        Args:
+            secret_key (SecretKey, bytes, str): the key, its 32 bytes, or their
+                hex encoding. The wallet takes ownership of a `SecretKey` and
+                frees it when zeroized or closed.
+            hrp (str): bech32 human-readable part of the address. Defaults to
+                DEFAULT_BECH32_HRP.
+
+        Returns:
+            Wallet: wallet signing with `secret_key`
+        """
+        if isinstance(secret_key, bytes):
+            secret_key = SecretKey.from_bytes(secret_key)
+        elif isinstance(secret_key, str):
+            secret_key = SecretKey.from_hex(secret_key)
+        wallet = cls.__new__(cls)
+        wallet._setup(None, None, hrp, owns_wallet=False, key=secret_key)
+        return wallet
+
+    def derive(self, path: str) -> "Wallet":
+        """Returns a wallet for another derivation path of the same seed.
+
+        The new wallet shares this wallet's native HD wallet, so the seed
+        is not recovered again, and only derives and caches its own key.
+        Closing it does not affect this wallet, but once this wallet is
+        closed the derived one can no longer derive new keys.
+
+        Args:
+            path (str): BIP32 derivation path, e.g. "m/44'/394'/0'/0/7"
+
+        Returns:
+            Wallet: wallet for `path`, with the same `hrp`
+        """
+        child = type(self).__new__(type(self))
+        child._setup(self._hd_wallet(), path, self.hrp, owns_wallet=False)
+        return child
+
+    def account(self, index: int) -> "Wallet":
+        """Returns the wallet for another address index of the same seed.
+
+        This is `derive()` with the last component of `path`, the BIP44
+        address index, replaced by `index`.
+
+        Args:
+            index (int): address index, between 0 and 2**31 - 1
+
+        Returns:
+            Wallet: wallet for the address index
+        """
+        if not 0 <= index < 2**31:
+            raise ValueError(f"index should be between 0 and 2**31 - 1, got {index}")
+        self._hd_wallet()
+        assert self.path is not None
+        return self.derive(f"{self.path.rsplit('/', 1)[0]}/{index}")
+
+    @property
+    def path(self) -> Optional[str]:
+        return self._path
+
+    @path.setter
+    def path(self, path: str) -> None:
+        self._hd_wallet()
+        self._path = path
+        self.invalidate()
+
+    @property
+    def hrp(self) -> str:
+        return self._hrp
+
+    @hrp.setter
+    def hrp(self, hrp: str) -> None:
+        # Only the address depends on the hrp, the key is kept.
+        self._hrp = hrp
+        self._address = None
 
     @property
     def private_key(self) -> bytes:
@@ -41,22 +354,83 @@ class Wallet:
         `chainlibpy.BIP32DerivationError` if the resulting private key
         is invalid.
         """
-        return bytes(self.wallet.get_key(self.path).to_bytes())
+        return self.secret_key.to_bytes()
 
     @property
     def public_key(self) -> bytes:
-        return bytes(self.wallet.get_key(self.path).get_public_key_bytes())
+        if self._public_key is None:
+            self._public_key = self.secret_key.get_public_key_bytes()
+        return self._public_key
 
     @property
     def address(self) -> str:
-        if self.hrp == "cro":
-            return self.wallet.get_default_address(
-                WalletCoin.COSMOS_SDK(Network.CRYPTO_ORG_MAINNET())
-            )
-        else:
-            return self.wallet.get_default_address(
-                WalletCoin.COSMOS_SDK(Network.CRYPTO_ORG_TESTNET())
-            )
+        """The bech32 address of `public_key` under `hrp`, computed once."""
+        if self._address is None:
+            self._address = address_from_public_key(self.public_key, self.hrp)
+        return self._address
+
+    @property
+    def secret_key(self) -> SecretKey:
+        """The key derived from the seed at `path`.
+
+        It is derived on first use and kept until `invalidate()`,
+        `zeroize()` or `close()` is called, or `path` is changed. The
+        wallet owns the key, so it must not be closed by the caller.
+        """
+        key = self._key
+        if key is None:
+            # `_hd_wallet()` takes the lock itself to recover the seed.
+            hd_wallet = self._hd_wallet()
+            with self._lock:
+                key = self._key
+                if key is None:
+                    key = self._key = hd_wallet.get_key(self.path)
+        return key
+
+    def derive_addresses(
+        self,
+        start: int = 0,
+        count: int = 1,
+        network: Optional[Network] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_ADDRESS_CHUNK_SIZE,
+    ) -> Iterator[str]:
+        """Derives the addresses of a range of address indices.
+
+        Addresses are yielded in index order as they are derived, so large
+        ranges can be streamed. Without a `network`, they are the addresses of
+        `account()`, with this wallet's `path` and `hrp`. With a `network`,
+        they follow its default derivation path (e.g. m/44'/394'/0'/0/index).
+
+        With more than one worker, the range is split into chunks of
+        `chunk_size` indices and derived in a `ProcessPoolExecutor`. Each
+        worker process recovers the wallet once from its backup mnemonic.
+
+        Args:
+            start (int): first address index. Defaults to 0.
+            count (int): number of addresses. Defaults to 1.
+            network (Network, optional): network of the addresses. Defaults to
+                the addresses of this wallet's accounts.
+            workers (int, optional): number of worker processes. Defaults to
+                deriving in this process.
+            chunk_size (int): indices derived per worker task.
+
+        Returns:
+            Iterator[str]: bech32 addresses of indices `start` to `start + count - 1`
+        """
+        if start < 0 or count < 0 or start + count > 2**31:
+            raise ValueError(f"indices should be between 0 and 2**31 - 1, got {start}+{count}")
+        wallet = self._hd_wallet()
+        derivation = self._address_derivation(network)
+        indices = range(start, start + count)
+
+        if workers is None or workers <= 1:
+            return _iter_addresses(wallet, derivation, indices)
+
+        mnemonic = wallet.get_backup_mnemonic_phrase()
+        if mnemonic is None:
+            raise ValueError("the wallet has no mnemonic to share with worker processes")
+        return _derive_addresses_in_processes(mnemonic, derivation, indices, workers, chunk_size)
 
     def sign_tx(self, tx_info: CosmosSdkTxInfo, msgs: List[CosmosSdkMsg]) -> bytes:
         """Constructs and signs the transaction with wallet's private key.
@@ -67,4 +441,182 @@ class Wallet:
         Returns:
             bytes: the signed transaction payload bytes
         """
-        return bytes(build_signed_msg_tx(tx_info, msgs, self.wallet.get_key(self.path)))
+        return build_signed_msg_tx(tx_info, msgs, self.secret_key)
+
+    def sign_txs(
+        self,
+        items: Iterable[Tuple[CosmosSdkTxInfo, List[CosmosSdkMsg]]],
+        workers: int = 1,
+    ) -> Iterator[bytes]:
+        """Signs many transactions, yielding each signed payload lazily.
+
+        Every transaction is signed with the same key handle, and fee and
+        network objects shared between transactions are only encoded once,
+        so they must not be modified while the batch is signed. `items` can
+        be a generator, it is consumed as the signed transactions are
+        yielded.
+
+        With more than one worker, transactions are signed in a thread
+        pool, a bounded number of them ahead of the one being yielded.
+
+        Args:
+            items (Iterable[Tuple[CosmosSdkTxInfo, List[CosmosSdkMsg]]]):
+                transaction information and messages of each transaction
+            workers (int): number of signing threads. Defaults to 1.
+
+        Returns:
+            Iterator[bytes]: the signed transaction payload bytes, in the
+            order of `items`
+        """
+        key = self.secret_key
+        encoder = fused_codecs.TxInfoEncoder()
+        encoded = (
+            (encoder.encode(tx_info), fused_codecs.encode_msgs(list(msgs)))
+            for tx_info, msgs in items
+        )
+        sign = fused_codecs.build_signed_msg_tx_encoded
+
+        if workers <= 1:
+            for tx_info_bytes, msgs_bytes in encoded:
+                yield sign(tx_info_bytes, msgs_bytes, key)
+            return
+
+        pending: "deque[Future[bytes]]" = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for tx_info_bytes, msgs_bytes in encoded:
+                    pending.append(executor.submit(sign, tx_info_bytes, msgs_bytes, key))
+                    if len(pending) >= workers * 4:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _hd_wallet(self) -> HdWallet:
+        if self.wallet is None:
+            with self._lock:
+                if self.wallet is None and self._seed is not None:
+                    self.wallet = HdWallet.recover_wallet(self._seed, password=None)
+                    self._seed = None
+            if self.wallet is None:
+                raise ValueError("the wallet was created from a secret key and has no HD wallet")
+        return self.wallet
+
+    def _address_derivation(self, network: Optional[Network]) -> AddressDerivation:
+        if network is not None:
+            return WalletCoin.COSMOS_SDK(network)
+        assert self.path is not None
+        match = _NATIVE_ADDRESS_PATH.fullmatch(self.path)
+        if match is None:
+            # Not a path the native library derives addresses along, derive the keys.
+            return (self.path.rsplit("/", 1)[0], self.hrp)
+        # Only the coin type and the hrp are used to derive addresses.
+        return WalletCoin.COSMOS_SDK(
+            Network.OTHER(chain_id="", coin_type=int(match.group(1)), bech32hrp=self.hrp)
+        )
+
+    def invalidate(self) -> None:
+        """Drops the cached key, public key and address.
+
+        They are derived again from the seed on next use. The key of a
+        wallet created by `from_secret_key()` is kept, as it can not be
+        derived again.
+        """
+        with self._lock:
+            self._public_key = None
+            self._address = None
+            if self.wallet is None and self._seed is None:
+                return
+            key, self._key = self._key, None
+        if key is not None:
+            key.close()
+
+    def zeroize(self) -> None:
+        """Frees the key and, unless this wallet was made by `derive()` or
+        `account()`, the native HD wallet holding the seed, so that this
+        wallet no longer owns any secret material.
+
+        The wallet can not be used afterwards.
+        """
+        with self._lock:
+            self._seed = None
+        self.invalidate()
+        if self.wallet is None:
+            with self._lock:
+                key, self._key = self._key, None
+            if key is not None:
+                key.close()
+        elif self._owns_wallet:
+            self.wallet.close()
+
+    def close(self) -> None:
+        """Frees the native key and HD wallet, see `zeroize()`.
+
+        Closing is optional, the native memory is otherwise freed once the
+        wallet is garbage collected.
+        """
+        self.zeroize()
+
+    def __enter__(self) -> "Wallet":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def export_wallets(wallets: Iterable[Wallet], path: PathLike, file_format: str = "csv") -> int:
+    """Writes the mnemonic, address and hex public key of each wallet, e.g.
+    to add generated accounts to a genesis file.
+
+    Rows are written as the wallets are iterated, so `wallets` can be a
+    generator.
+
+    Args:
+        wallets (Iterable[Wallet]): wallets recovered or generated from a
+            mnemonic seed
+        path (str): file to write
+        file_format (str): "csv" for a CSV file with a header row, or "jsonl"
+            for one JSON object per line. Defaults to "csv".
+
+    Returns:
+        int: number of wallets written
+    """
+    if file_format not in _EXPORT_WRITERS:
+        raise ValueError(f"file_format should be 'csv' or 'jsonl', got {file_format!r}")
+
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        write = _EXPORT_WRITERS[file_format](f)
+        for wallet in wallets:
+            mnemonic = wallet._hd_wallet().get_backup_mnemonic_phrase()
+            if mnemonic is None:
+                raise ValueError("the wallet has no mnemonic to export")
+            write(
+                {
+                    "mnemonic": mnemonic,
+                    "address": wallet.address,
+                    "public_key": wallet.public_key.hex(),
+                }
+            )
+            count += 1
+    return count
+
+
+def _csv_writer(f: TextIO) -> Callable[[Dict[str, str]], None]:
+    writer = csv.DictWriter(f, fieldnames=["mnemonic", "address", "public_key"])
+    writer.writeheader()
+    return writer.writerow
+
+
+def _jsonl_writer(f: TextIO) -> Callable[[Dict[str, str]], None]:
+    return lambda row: f.write(json.dumps(row) + "\n")
+
+
+_EXPORT_WRITERS = {"csv": _csv_writer, "jsonl": _jsonl_writer}
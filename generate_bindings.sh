@@ -1,7 +1,10 @@
 #!/bin/bash
+set -e
 CORE_PATH=defi-wallet-core-rs/common
 UDL_PATH=$CORE_PATH/src/common.udl
 CONFIG_PATH=$CORE_PATH/uniffi.toml
 OUTPUT_PATH=chainlibpy/generated/
 
-uniffi-bindgen generate $UDL_PATH --config $CONFIG_PATH --language python --out-dir $OUTPUT_PATH
\ No newline at end of file
+uniffi-bindgen generate $UDL_PATH --config $CONFIG_PATH --language python --out-dir $OUTPUT_PATH
+# Changes that can not be made at runtime, see chainlibpy/ffi_support.py
+patch -p1 --forward < generated_bindings.patch
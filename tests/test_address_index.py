@@ -0,0 +1,57 @@
+import pytest
+
+from chainlibpy.address_index import AddressIndex, AddressIndexFile
+from chainlibpy.wallet import Wallet
+
+from .utils import SEED
+
+
+def test_index_finds_derived_addresses_and_extends_past_the_gap():
+    wallet = Wallet(SEED)
+    index = AddressIndex(wallet, gap_limit=5)
+
+    assert len(index) == 5
+    assert index.index_of(wallet.account(3).address) == 3
+    assert len(index) == 9
+    assert index.index_of(wallet.account(8).address) == 8
+    assert len(index) == 14
+    assert index.index_of(wallet.account(20).address) is None
+
+
+def test_saved_index_is_looked_up_from_the_file(tmp_path):
+    wallet = Wallet(SEED)
+    index = AddressIndex(wallet, gap_limit=30)
+    path = tmp_path / "addresses.idx"
+    index.save(path)
+
+    with AddressIndexFile(path) as saved:
+        assert len(saved) == 30
+        assert saved.next_index == 30
+        assert saved.index_of(wallet.account(17).address) == 17
+        assert saved.index_of("cro1notanaddress") is None
+        assert sorted(index for _, index in saved.items()) == list(range(30))
+
+    loaded = AddressIndex.load(path, wallet, gap_limit=30)
+    assert len(loaded) == 30
+    assert loaded.index_of(wallet.account(29).address) == 29
+    assert len(loaded) == 60
+    assert loaded.index_of(wallet.account(45).address) == 45
+    loaded.save(path)
+    loaded.close()
+
+    with AddressIndexFile(path) as saved:
+        assert len(saved) == 76
+        assert saved.index_of(wallet.account(45).address) == 45
+
+
+def test_saved_index_is_not_loaded_for_another_wallet_or_network(tmp_path):
+    path = tmp_path / "addresses.idx"
+    AddressIndex(Wallet(SEED), gap_limit=5).save(path)
+
+    with pytest.raises(ValueError):
+        AddressIndex.load(path, Wallet.new())
+    with pytest.raises(ValueError):
+        AddressIndex.load(path, Wallet(SEED, hrp="tcro"))
+    with pytest.raises(ValueError):
+        AddressIndex.load(path, Wallet(SEED, "m/44'/394'/1'/0/0"))
+    AddressIndex.load(path, Wallet(SEED)).close()
@@ -0,0 +1,56 @@
+from chainlibpy.utils.bech32 import (
+    _pure_ripemd160,
+    address_from_public_key,
+    addresses_for_prefixes,
+    bech32_encode,
+)
+from chainlibpy.wallet import Wallet
+
+from .utils import SEED
+
+
+def test_bech32_encode_matches_bip173():
+    data = bytes.fromhex("751e76e8199196d454941c45d1b3a323f1433bd6")
+    assert bech32_encode("bc", data) == "bc1w508d6qejxtdg4y5r3zarvary0c5xw7kj7gz7z"
+
+
+def test_pure_ripemd160_matches_reference_vectors():
+    assert _pure_ripemd160(b"").hex() == "9c1185a5c5e9fc54612808977ee8f548b2258d31"
+    assert _pure_ripemd160(b"abc").hex() == "8eb208f7e05d987a9b044a8e98c6b087f15a0bfc"
+    assert _pure_ripemd160(b"message digest").hex() == "5d0689ef49d2fae572b881b123a85ffa21595f36"
+    message = b"abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq"
+    assert _pure_ripemd160(message).hex() == "12a053384a9c0c88e405a06c27dcf49ada62eb2b"
+
+
+def test_wallet_address_matches_known_addresses_for_any_hrp():
+    # Public key 02089cf5...969a0c of the seed at m/44'/394'/0'/0/0, under each hrp.
+    known_addresses = {
+        "cro": "cro1yj3fd8gxrqd2662p8ywp26t4hfws9p5n75xjum",
+        "tcro": "tcro1yj3fd8gxrqd2662p8ywp26t4hfws9p5nsp0ku2",
+        "devnet": "devnet1yj3fd8gxrqd2662p8ywp26t4hfws9p5new6tsa",
+    }
+    for hrp, address in known_addresses.items():
+        wallet = Wallet(SEED, hrp=hrp)
+
+        assert wallet.address == address
+        assert next(wallet.derive_addresses()) == address
+
+
+def test_derived_addresses_follow_the_wallet_path():
+    for path in ("m/44'/394'/0'/0/0", "m/44'/1'/0'/0/0", "m/44'/394'/1'/0/0"):
+        wallet = Wallet(SEED, path, hrp="tcro")
+        accounts = [wallet.account(index).address for index in range(3)]
+
+        assert accounts[0] == wallet.address
+        assert list(wallet.derive_addresses(0, 3)) == accounts
+        assert list(wallet.derive_addresses(0, 3, workers=2, chunk_size=2)) == accounts
+
+
+def test_addresses_for_prefixes():
+    wallet = Wallet(SEED)
+    public_keys = [wallet.account(index).public_key for index in range(3)]
+
+    addresses = addresses_for_prefixes(public_keys, ["cro", "devnet"])
+
+    assert addresses["cro"] == [wallet.account(index).address for index in range(3)]
+    assert addresses["devnet"] == [address_from_public_key(key, "devnet") for key in public_keys]
@@ -0,0 +1,159 @@
+import hypothesis.strategies as st
+import pytest
+from hypothesis import given
+
+from chainlibpy.ffi_support import (
+    RustBufferBuilder,
+    RustBufferStream,
+    rust_buffer_stats,
+)
+from chainlibpy.generated import common
+from chainlibpy.generated.common import (
+    CosmosSdkClient,
+    CosmosSdkMsg,
+    CosmosSdkTxInfo,
+    FfiConverterSequenceTypeCosmosSdkMsg,
+    FfiConverterSequenceUInt8,
+    FfiConverterString,
+    FfiConverterTypeCosmosSdkTxInfo,
+    FfiConverterTypeTxBroadcastResult,
+    InternalError,
+    Network,
+    SingleCoin,
+    TxBroadcastMode,
+    TxBroadcastResult,
+)
+
+
+def _written_bytes(builder: RustBufferBuilder) -> bytes:
+    rbuf = builder.finalize()
+    try:
+        return rbuf.data[0 : rbuf.len]
+    finally:
+        rbuf.free()
+
+
+@given(chunks=st.lists(st.binary(max_size=300), max_size=20))
+def test_builder_write_copies_whole_chunks(chunks):
+    builder = RustBufferBuilder()
+    for chunk in chunks:
+        builder.write(chunk)
+
+    assert _written_bytes(builder) == b"".join(chunks)
+
+
+@given(
+    u8=st.integers(min_value=0, max_value=2**8 - 1),
+    i32=st.integers(min_value=-(2**31), max_value=2**31 - 1),
+    u64=st.integers(min_value=0, max_value=2**64 - 1),
+)
+def test_builder_packs_big_endian_integers(u8, i32, u64):
+    builder = RustBufferBuilder()
+    builder.writeU8(u8)
+    builder.writeI32(i32)
+    builder.writeU64(u64)
+
+    assert _written_bytes(builder) == (
+        u8.to_bytes(1, "big") + i32.to_bytes(4, "big", signed=True) + u64.to_bytes(8, "big")
+    )
+
+
+@given(value=st.text(max_size=2_000))
+def test_string_round_trip(value):
+    assert FfiConverterString.lift(FfiConverterString.lower(value)) == value
+
+
+@given(
+    numbers=st.tuples(*[st.integers(min_value=0, max_value=2**64 - 1)] * 3),
+    memo=st.one_of(st.none(), st.text(max_size=512)),
+)
+def test_tx_info_round_trip(numbers, memo):
+    tx_info = CosmosSdkTxInfo(
+        *numbers,
+        SingleCoin.OTHER("1000", "basecro"),
+        0,
+        memo,
+        Network.OTHER("chain-maind", 394, "cro"),
+    )
+
+    rbuf = FfiConverterTypeCosmosSdkTxInfo.lower(tx_info)
+
+    assert FfiConverterTypeCosmosSdkTxInfo.lift(rbuf) == tx_info
+
+
+@given(value=st.binary(max_size=4_096))
+def test_byte_sequence_round_trip_as_bytes(value):
+    lifted = FfiConverterSequenceUInt8.lift(FfiConverterSequenceUInt8.lower(value))
+
+    assert isinstance(lifted, bytes)
+    assert lifted == value
+
+
+@given(value=st.binary(max_size=300))
+def test_byte_sequence_accepts_int_lists(value):
+    from_list = FfiConverterSequenceUInt8.lower(list(value))
+    from_bytes = FfiConverterSequenceUInt8.lower(value)
+
+    assert from_list.data[0 : from_list.len] == from_bytes.data[0 : from_bytes.len]
+    assert from_list.data[0:4] == len(value).to_bytes(4, "big")
+    from_list.free()
+    from_bytes.free()
+
+
+class _UniterableBytes(bytes):
+    def __iter__(self):
+        raise AssertionError("the bytes were iterated")
+
+
+def test_broadcast_and_simulate_pass_signed_bytes_on_without_iterating(monkeypatch):
+    raw_signed_tx = _UniterableBytes(b"signed tx" * 100)
+    lowered = []
+
+    def rust_call_with_error(error_ffi_converter, fn, pointer, raw_signed_tx, *args):
+        lowered.append(FfiConverterSequenceUInt8.lift(raw_signed_tx))
+        if args:
+            return FfiConverterTypeTxBroadcastResult.lower(TxBroadcastResult("ABCD", 0, ""))
+        return 80_000
+
+    monkeypatch.setattr(common, "rust_call_with_error", rust_call_with_error)
+    # A client without a native handle, the call never reaches the library.
+    monkeypatch.setattr(CosmosSdkClient, "_pointer", 1)
+    client = CosmosSdkClient.__new__(CosmosSdkClient)
+
+    assert client.simulate(raw_signed_tx) == 80_000
+    assert client.broadcast_tx(raw_signed_tx, TxBroadcastMode.SYNC()).tx_hash_hex == "ABCD"
+    assert common.simulate_blocking("http://localhost:9090", raw_signed_tx) == 80_000
+    assert lowered == [raw_signed_tx] * 3
+
+
+def test_stream_refuses_to_read_past_end():
+    builder = RustBufferBuilder()
+    builder.writeU32(7)
+    rbuf = builder.finalize()
+    stream = RustBufferStream(rbuf)
+
+    with pytest.raises(InternalError, match="read past end of rust buffer"):
+        stream.readU64()
+    with pytest.raises(InternalError, match="read past end of rust buffer"):
+        stream.read(5)
+    assert stream.readU32() == 7
+    assert stream.remaining() == 0
+    rbuf.free()
+
+
+def test_lowering_allocates_the_exact_size_once():
+    msgs = [
+        CosmosSdkMsg.BANK_SEND(
+            "cro1yj3fd8gxrqd2662p8ywp26t4hfws9p5n75xjum", SingleCoin.OTHER("1000", "basecro")
+        )
+    ] * 10
+    before = rust_buffer_stats.snapshot()
+
+    rbuf = FfiConverterSequenceTypeCosmosSdkMsg.lower(msgs)
+
+    after = rust_buffer_stats.snapshot()
+    assert rbuf.len == FfiConverterSequenceTypeCosmosSdkMsg.size_of(msgs)
+    assert after["allocs"] - before["allocs"] == 1
+    assert after["reserves"] == before["reserves"]
+    assert after["reserves_avoided"] > before["reserves_avoided"]
+    rbuf.free()
@@ -0,0 +1,108 @@
+import hypothesis.strategies as st
+from hypothesis import given
+
+from chainlibpy import fused_codecs
+from chainlibpy.generated.common import (
+    CosmosSdkMsg,
+    CosmosSdkTxInfo,
+    FfiConverterSequenceTypeCosmosSdkMsg,
+    FfiConverterTypeCosmosSdkTxInfo,
+    FfiConverterTypeRawRpcAccountStatus,
+    FfiConverterTypeRawRpcBalance,
+    FfiConverterTypeSingleCoin,
+    FfiConverterTypeTxBroadcastResult,
+    Network,
+    RawRpcAccountStatus,
+    RawRpcBalance,
+    RawRpcPubKey,
+    SingleCoin,
+    TxBroadcastResult,
+)
+
+u32 = st.integers(min_value=0, max_value=2**32 - 1)
+u64 = st.integers(min_value=0, max_value=2**64 - 1)
+
+networks = st.one_of(
+    st.just(Network.CRYPTO_ORG_MAINNET()),
+    st.just(Network.CRYPTO_ORG_TESTNET()),
+    st.just(Network.CRONOS_MAINNET()),
+    st.just(Network.COSMOS_HUB()),
+    st.builds(Network.OTHER, st.text(), u32, st.text()),
+)
+coins = st.one_of(
+    st.builds(SingleCoin.BASE_CRO, u64),
+    st.builds(SingleCoin.CRO, u64, networks),
+    st.builds(SingleCoin.TESTNET_BASE_CRO, u64),
+    st.builds(SingleCoin.TESTNET_CRO, u64),
+    st.builds(SingleCoin.UATOM, u64),
+    st.builds(SingleCoin.ATOM, u64),
+    st.builds(SingleCoin.OTHER, st.text(), st.text()),
+)
+tx_infos = st.builds(
+    CosmosSdkTxInfo, u64, u64, u64, coins, u32, st.one_of(st.none(), st.text()), networks
+)
+msgs = st.one_of(
+    st.builds(CosmosSdkMsg.BANK_SEND, st.text(), coins),
+    st.builds(CosmosSdkMsg.STAKING_DELEGATE, st.text(), coins),
+    st.builds(CosmosSdkMsg.NFT_BURN, st.text(), st.text()),
+    st.builds(CosmosSdkMsg.EXECUTE_CONTRACT, st.text(), st.binary(), coins),
+)
+account_statuses = st.builds(
+    RawRpcAccountStatus,
+    st.text(),
+    st.text(),
+    st.one_of(st.none(), st.builds(RawRpcPubKey, st.text(), st.text())),
+    u64,
+    u64,
+)
+balances = st.builds(RawRpcBalance, st.text(), st.text())
+broadcast_results = st.builds(TxBroadcastResult, st.text(), u32, st.text())
+
+
+def _lowered_bytes(converter, value) -> bytes:
+    rbuf = converter.lower(value)
+    try:
+        return rbuf.data[0 : rbuf.len]
+    finally:
+        rbuf.free()
+
+
+def _assert_compatible(converter, value):
+    fused_codecs.install()
+    fused = _lowered_bytes(converter, value)
+    with fused_codecs.generic_codecs():
+        generic = _lowered_bytes(converter, value)
+        generic_lifted = converter.lift(converter.lower(value))
+
+    assert fused == generic
+    assert converter.lift(converter.lower(value)) == generic_lifted
+
+
+@given(coin=coins)
+def test_single_coin_matches_generated_codec(coin):
+    _assert_compatible(FfiConverterTypeSingleCoin, coin)
+
+
+@given(tx_info=tx_infos)
+def test_tx_info_matches_generated_codec(tx_info):
+    _assert_compatible(FfiConverterTypeCosmosSdkTxInfo, tx_info)
+
+
+@given(msg_list=st.lists(msgs, max_size=5))
+def test_msgs_match_generated_codec(msg_list):
+    _assert_compatible(FfiConverterSequenceTypeCosmosSdkMsg, msg_list)
+
+
+@given(account=account_statuses)
+def test_account_status_matches_generated_codec(account):
+    _assert_compatible(FfiConverterTypeRawRpcAccountStatus, account)
+
+
+@given(balance=balances)
+def test_balance_matches_generated_codec(balance):
+    _assert_compatible(FfiConverterTypeRawRpcBalance, balance)
+
+
+@given(result=broadcast_results)
+def test_broadcast_result_matches_generated_codec(result):
+    _assert_compatible(FfiConverterTypeTxBroadcastResult, result)
@@ -0,0 +1,90 @@
+from typing import List
+
+import pytest
+
+from chainlibpy.gas import GasEstimator, message_shape
+from chainlibpy.generated.common import CosmosSdkMsg, RawRpcAccountStatus, SingleCoin
+from chainlibpy.transaction import DEFAULT_GAS_LIMIT, Transaction
+from chainlibpy.wallet import Wallet
+
+from .utils import ADDRESS, SEED
+
+GAS_USED = 80_000
+
+
+class FakeClient:
+    def __init__(self, clock: List[float]) -> None:
+        self.gas_estimator = GasEstimator(ttl=60, clock=lambda: clock[0])
+        self.simulated: List[bytes] = []
+
+    def query_account(self, address: str) -> RawRpcAccountStatus:
+        return RawRpcAccountStatus("BaseAccount", address, None, 7, 100)
+
+    def simulate(self, tx_byte: bytes) -> int:
+        self.simulated.append(tx_byte)
+        return GAS_USED * len(self.simulated)
+
+
+def _sends(count: int) -> List[CosmosSdkMsg]:
+    return [
+        CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.BASE_CRO(amount)) for amount in range(count)
+    ]
+
+
+def _auto_tx(client: FakeClient, msgs: List[CosmosSdkMsg]) -> Transaction:
+    return Transaction("chain-maind", Wallet(SEED), msgs, 7, client, gas_limit="auto")
+
+
+def test_message_shape_counts_variants():
+    msgs = _sends(3) + [CosmosSdkMsg.DISTRIBUTION_WITHDRAW_DELEGATOR_REWARD("crocncl1")]
+
+    assert message_shape(msgs) == (("BANK_SEND", 3), ("DISTRIBUTION_WITHDRAW_DELEGATOR_REWARD", 1))
+    assert message_shape(reversed(msgs)) == message_shape(msgs)
+
+
+def test_auto_gas_limit_is_simulated_once_per_shape():
+    client = FakeClient([0.0])
+    tx = _auto_tx(client, _sends(3))
+    signed_tx = tx.signed_tx
+
+    assert len(client.simulated) == 1
+    assert tx._tx_info.gas_limit == 104_000
+    assert signed_tx != client.simulated[0]
+
+    assert _auto_tx(client, _sends(3)).signed_tx == signed_tx
+    assert len(client.simulated) == 1
+
+    _auto_tx(client, _sends(2)).signed_tx
+    assert len(client.simulated) == 2
+
+
+def test_auto_gas_limit_is_simulated_again_after_ttl():
+    clock = [0.0]
+    client = FakeClient(clock)
+    _auto_tx(client, _sends(1)).signed_tx
+
+    clock[0] = 59.0
+    _auto_tx(client, _sends(1)).signed_tx
+    assert len(client.simulated) == 1
+
+    clock[0] = 60.0
+    tx = _auto_tx(client, _sends(1))
+    tx.signed_tx
+    assert len(client.simulated) == 2
+    assert tx._tx_info.gas_limit == 208_000
+
+
+def test_auto_gas_limit_needs_a_client():
+    with pytest.raises(ValueError):
+        Transaction("chain-maind", Wallet(SEED), _sends(1), 7, sequence=0, gas_limit="auto")
+    with pytest.raises(ValueError):
+        Transaction("chain-maind", Wallet(SEED), _sends(1), 7, FakeClient([0.0]), gas_limit="max")
+
+
+def test_fixed_gas_limit_is_not_simulated():
+    client = FakeClient([0.0])
+    tx = Transaction("chain-maind", Wallet(SEED), _sends(1), 7, client)
+    tx.signed_tx
+
+    assert client.simulated == []
+    assert tx._tx_info.gas_limit == DEFAULT_GAS_LIMIT
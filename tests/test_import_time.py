@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+
+def _import_in_subprocess(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _cumulative_import_us(importtime_output: str, module: str) -> int:
+    # Lines look like "import time:   self [us] |  cumulative | imported package".
+    for line in importtime_output.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} was not imported")
+
+
+def test_import_does_not_load_the_native_library(record_property):
+    result = _import_in_subprocess(
+        "import chainlibpy\n"
+        "from chainlibpy.generated import common\n"
+        "print(common._UniFFILib.is_loaded())\n"
+    )
+
+    assert result.stdout.strip() == "False"
+    record_property("chainlibpy_import_us", _cumulative_import_us(result.stderr, "chainlibpy"))
+
+
+def test_coin_arithmetic_does_not_import_the_bindings():
+    result = _import_in_subprocess(
+        "import sys\n"
+        "from chainlibpy import CRO_NETWORK, CROCoin\n"
+        "coin = CROCoin('1.5', 'cro', CRO_NETWORK['mainnet'])\n"
+        "coin = coin + CROCoin('1', 'basecro', CRO_NETWORK['mainnet'])\n"
+        "print(coin.amount_base, 'chainlibpy.generated.common' in sys.modules)\n"
+    )
+
+    assert result.stdout.split() == ["150000001", "False"]
@@ -0,0 +1,110 @@
+import os
+import struct
+
+import pytest
+
+from chainlibpy.ffi_support import native_handle_stats
+from chainlibpy.key_cache import KeyCache
+from chainlibpy.wallet import Wallet
+
+from .utils import SEED
+
+# Cheap scrypt parameters, the defaults take a noticeable time per test.
+FAST_KDF = {"n": 2**10, "r": 8, "p": 1}
+
+
+def test_key_cache_round_trips_through_the_file(tmp_path):
+    path = tmp_path / "keys.cache"
+    cache = KeyCache(path, "passphrase", **FAST_KDF)
+    cache.put(SEED, "m/44'/394'/0'/0/0", "cro", b"\x01" * 32, b"\x02" * 33, "cro1address")
+    cache.save()
+
+    assert SEED.encode() not in path.read_bytes()
+    if os.name == "posix":
+        assert path.stat().st_mode & 0o777 == 0o600
+    cached = KeyCache(path, "passphrase").get(SEED, "m/44'/394'/0'/0/0", "cro")
+    assert cached == (b"\x01" * 32, b"\x02" * 33, "cro1address")
+    assert KeyCache(path, "passphrase").get(SEED, "m/44'/394'/0'/0/0", "tcro") is None
+
+
+def test_key_cache_saves_again_after_a_failed_write(tmp_path, monkeypatch):
+    path = tmp_path / "keys.cache"
+    cache = KeyCache(path, "passphrase", **FAST_KDF)
+    cache.put(SEED, "m/44'/394'/0'/0/0", "cro", b"\x01" * 32, b"\x02" * 33, "cro1address")
+
+    def fail(source, destination):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("chainlibpy.key_cache.os.replace", fail)
+        with pytest.raises(OSError):
+            cache.save()
+    assert not path.exists()
+
+    cache.save()
+    assert KeyCache(path, "passphrase").get(SEED, "m/44'/394'/0'/0/0", "cro") is not None
+
+
+def test_key_cache_rejects_a_wrong_passphrase_or_a_modified_file(tmp_path):
+    path = tmp_path / "keys.cache"
+    cache = KeyCache(path, "passphrase", **FAST_KDF)
+    cache.put(SEED, "m/44'/394'/0'/0/0", "cro", b"\x01" * 32, b"\x02" * 33, "cro1address")
+    cache.save()
+
+    with pytest.raises(ValueError):
+        KeyCache(path, "wrong passphrase")
+
+    data = bytearray(path.read_bytes())
+    data[-40] ^= 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        KeyCache(path, "passphrase")
+
+
+def test_key_cache_rejects_files_it_can_not_read(tmp_path):
+    path = tmp_path / "keys.cache"
+    cache = KeyCache(path, "passphrase", **FAST_KDF)
+    cache.put(SEED, "m/44'/394'/0'/0/0", "cro", b"\x01" * 32, b"\x02" * 33, "cro1address")
+    cache.save()
+    data = path.read_bytes()
+
+    for contents in (b"", data[:20], b"not a key cache" * 10):
+        path.write_bytes(contents)
+        with pytest.raises(ValueError):
+            KeyCache(path, "passphrase")
+
+    # A forged header asking scrypt for 2**40 bytes is refused before running it.
+    magic, salt, _, _, p = struct.unpack_from(">8s16sIII", data)
+    path.write_bytes(struct.pack(">8s16sIII", magic, salt, 2**24, 2**9, p) + data[36:])
+    with pytest.raises(ValueError):
+        KeyCache(path, "passphrase")
+
+
+def test_wallet_loaded_from_the_cache_skips_recovery(tmp_path):
+    path = tmp_path / "keys.cache"
+    cache = KeyCache(path, "passphrase", **FAST_KDF)
+    with Wallet(SEED, cache=cache) as wallet:
+        expected = (wallet.private_key, wallet.public_key, wallet.address)
+        derived_address = wallet.account(1).address
+    cache.save()
+
+    recovered = native_handle_stats.live("HdWallet")
+    wallet = Wallet(SEED, cache=KeyCache(path, "passphrase"))
+    assert (wallet.private_key, wallet.public_key, wallet.address) == expected
+    assert native_handle_stats.live("HdWallet") == recovered
+
+    # Other keys still derive, from the seed recovered on demand.
+    assert wallet.account(1).address == derived_address
+    wallet.close()
+
+
+def test_wallet_loaded_from_the_cache_derives_its_key_after_invalidate(tmp_path):
+    path = tmp_path / "keys.cache"
+    cache = KeyCache(path, "passphrase", **FAST_KDF)
+    with Wallet(SEED, cache=cache) as wallet:
+        expected = (wallet.private_key, wallet.address)
+    cache.save()
+
+    with Wallet(SEED, cache=KeyCache(path, "passphrase")) as wallet:
+        wallet.invalidate()
+        assert (wallet.private_key, wallet.address) == expected
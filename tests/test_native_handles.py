@@ -0,0 +1,32 @@
+import gc
+
+import pytest
+
+from chainlibpy.ffi_support import native_handle_stats
+from chainlibpy.generated.common import InternalError, SecretKey
+
+
+def test_close_frees_the_handle():
+    live = native_handle_stats.live("SecretKey")
+
+    with SecretKey() as key:
+        assert native_handle_stats.live("SecretKey") == live + 1
+        assert not key.closed
+
+    assert key.closed
+    assert native_handle_stats.live("SecretKey") == live
+    with pytest.raises(InternalError, match="SecretKey has been closed"):
+        key.to_hex()
+    key.close()
+    assert native_handle_stats.live("SecretKey") == live
+
+
+def test_unreachable_cycle_is_freed():
+    live = native_handle_stats.live("SecretKey")
+    key = SecretKey()
+    key.self_reference = key
+    del key
+
+    gc.collect()
+
+    assert native_handle_stats.live("SecretKey") == live
@@ -0,0 +1,88 @@
+import base64
+import json
+
+import pytest
+
+from chainlibpy.generated.common import CosmosSdkMsg, RawRpcAccountStatus, SingleCoin
+from chainlibpy.offline_signing import sign_jsonl
+from chainlibpy.transaction import Transaction
+from chainlibpy.wallet import Wallet
+
+from .utils import ADDRESS, SEED
+
+CHAIN_ID = "crypto-org-chain-mainnet-1"
+
+
+def _spec(sequence: int) -> dict:
+    return {
+        "id": f"payout-{sequence}",
+        "chain_id": CHAIN_ID,
+        "account_number": 7,
+        "sequence": sequence,
+        "msgs": [
+            {
+                "type": "BANK_SEND",
+                "recipient_address": ADDRESS,
+                "amount": {"amount": str(1000 + sequence), "denom": "basecro"},
+            }
+        ],
+        "fee": {"amount": "5000", "denom": "basecro"},
+        "memo": "payout",
+    }
+
+
+def _offline_tx(wallet: Wallet, sequence: int) -> Transaction:
+    msgs = [CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.OTHER(str(1000 + sequence), "basecro"))]
+    return Transaction(
+        CHAIN_ID,
+        wallet,
+        msgs,
+        7,
+        fee=SingleCoin.OTHER("5000", "basecro"),
+        memo="payout",
+        sequence=sequence,
+    )
+
+
+def test_transaction_signs_offline_with_an_explicit_sequence():
+    wallet = Wallet(SEED)
+    account = RawRpcAccountStatus("BaseAccount", wallet.address, None, 7, 3)
+
+    tx = _offline_tx(wallet, 3)
+    from_account = Transaction(
+        CHAIN_ID,
+        wallet,
+        tx._msgs,
+        fee=SingleCoin.OTHER("5000", "basecro"),
+        memo="payout",
+        account=account,
+    )
+
+    assert tx.sequence == 3
+    assert tx.signed_tx == from_account.signed_tx
+    with pytest.raises(ValueError):
+        Transaction(CHAIN_ID, wallet, tx._msgs, 7)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_sign_jsonl_streams_signed_transactions(tmp_path, workers):
+    wallet = Wallet(SEED)
+    specs = tmp_path / "unsigned.jsonl"
+    specs.write_text("".join(json.dumps(_spec(sequence)) + "\n" for sequence in range(20)))
+
+    assert sign_jsonl(wallet, specs, tmp_path / "signed.jsonl", workers) == 20
+
+    rows = [json.loads(line) for line in (tmp_path / "signed.jsonl").read_text().splitlines()]
+    assert [row["id"] for row in rows] == [f"payout-{sequence}" for sequence in range(20)]
+    assert [base64.b64decode(row["tx_bytes"]) for row in rows] == [
+        _offline_tx(wallet, sequence).signed_tx for sequence in range(20)
+    ]
+
+
+def test_sign_jsonl_reports_the_invalid_line(tmp_path):
+    specs = tmp_path / "unsigned.jsonl"
+    invalid = dict(_spec(1), msgs=[{"type": "NOT_A_MSG"}])
+    specs.write_text(json.dumps(_spec(0)) + "\n" + json.dumps(invalid) + "\n")
+
+    with pytest.raises(ValueError, match="unsigned.jsonl:2"):
+        sign_jsonl(Wallet(SEED), specs, tmp_path / "signed.jsonl")
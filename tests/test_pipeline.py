@@ -0,0 +1,142 @@
+from typing import Dict, List, Optional
+
+from chainlibpy.generated.common import (
+    CosmosSdkMsg,
+    CosmosSdkTxInfo,
+    Network,
+    RawRpcAccountStatus,
+    SingleCoin,
+    TxBroadcastMode,
+    TxBroadcastResult,
+)
+from chainlibpy.pipeline import TxPipeline
+from chainlibpy.transaction import DEFAULT_GAS_LIMIT, ZERO_COIN
+from chainlibpy.wallet import Wallet
+
+from .utils import ADDRESS, SEED
+
+CHAIN_ID = "chain-maind"
+ACCOUNT_NUMBER = 7
+START_SEQUENCE = 100
+INSUFFICIENT_FUNDS_CODE = 5
+
+
+def _msgs(amount: int) -> List[CosmosSdkMsg]:
+    return [CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.BASE_CRO(amount))]
+
+
+class FakeNode:
+    """Stand-in for a node, committing up to `block_size` transactions from
+    its mempool each time the account is queried.
+
+    Transactions are recognised by signing every known message list with the
+    sequences it may have been given.
+    """
+
+    def __init__(
+        self,
+        wallet: Wallet,
+        amounts: List[int],
+        block_size: int,
+        failing_amount: Optional[int] = None,
+        dropped_sequence: Optional[int] = None,
+    ) -> None:
+        self.block_size = block_size
+        self.failing_amount = failing_amount
+        self.dropped_sequence = dropped_sequence
+        self.sequence = START_SEQUENCE
+        self.check_sequence = START_SEQUENCE
+        self.mempool: List[bytes] = []
+        self.blocks: List[List[int]] = []
+        self._txs: Dict[bytes, tuple] = {}
+
+        tx_info = CosmosSdkTxInfo(
+            ACCOUNT_NUMBER,
+            0,
+            DEFAULT_GAS_LIMIT,
+            ZERO_COIN,
+            0,
+            "",
+            Network.OTHER(CHAIN_ID, 394, "cro"),
+        )
+        for index, amount in enumerate(amounts):
+            for sequence in range(START_SEQUENCE + index - 2, START_SEQUENCE + index + 1):
+                tx_info.sequence_number = sequence
+                self._txs[wallet.sign_tx(tx_info, _msgs(amount))] = (sequence, amount)
+
+    def query_account(self, address: str) -> RawRpcAccountStatus:
+        block = []
+        while self.mempool and len(block) < self.block_size:
+            sequence, amount = self._txs[self.mempool[0]]
+            if sequence == self.dropped_sequence:
+                # Evicted: the transactions after it fail the recheck and are dropped too.
+                self.dropped_sequence = None
+                self.mempool.clear()
+                self.check_sequence = self.sequence
+                break
+            self.mempool.pop(0)
+            block.append(amount)
+            self.sequence += 1
+        if block:
+            self.blocks.append(block)
+        return RawRpcAccountStatus("BaseAccount", address, None, ACCOUNT_NUMBER, self.sequence)
+
+    def broadcast_transaction(self, tx: bytes, mode: TxBroadcastMode) -> TxBroadcastResult:
+        assert isinstance(mode, TxBroadcastMode.SYNC)
+        sequence, amount = self._txs[tx]
+        if sequence != self.check_sequence:
+            log = f"account sequence mismatch, expected {self.check_sequence}, got {sequence}"
+            return TxBroadcastResult("", 32, log + ": incorrect account sequence")
+        if amount == self.failing_amount:
+            return TxBroadcastResult("", INSUFFICIENT_FUNDS_CODE, "insufficient funds")
+        self.mempool.append(tx)
+        self.check_sequence += 1
+        return TxBroadcastResult(f"HASH{sequence}", 0, "")
+
+
+def _submit(node: FakeNode, wallet: Wallet, amounts: List[int], window: int) -> list:
+    pipeline = TxPipeline(node, wallet, CHAIN_ID, window=window, poll_interval=0, stall_timeout=0)
+    return list(pipeline.submit(_msgs(amount) for amount in amounts))
+
+
+def test_pipeline_lands_many_transactions_per_block():
+    wallet = Wallet(SEED)
+    amounts = list(range(1, 101))
+    node = FakeNode(wallet, amounts, block_size=40)
+
+    results = _submit(node, wallet, amounts, window=50)
+
+    assert all(result.included for result in results)
+    assert [result.sequence for result in results] == list(range(100, 200))
+    assert [amount for block in node.blocks for amount in block] == amounts
+    assert len(node.blocks) == 3
+
+
+def test_pipeline_signs_again_after_a_rejected_transaction():
+    wallet = Wallet(SEED)
+    amounts = list(range(1, 31))
+    node = FakeNode(wallet, amounts, block_size=40, failing_amount=10)
+
+    results = _submit(node, wallet, amounts, window=50)
+
+    failed = [result for result in results if not result.included]
+    assert [(result.sequence, result.code) for result in failed] == [
+        (109, INSUFFICIENT_FUNDS_CODE)
+    ]
+    included = [result.sequence for result in results if result.included]
+    assert included == list(range(100, 129))
+    assert [amount for block in node.blocks for amount in block] == [
+        amount for amount in amounts if amount != 10
+    ]
+
+
+def test_pipeline_broadcasts_again_after_a_gap():
+    wallet = Wallet(SEED)
+    amounts = list(range(1, 31))
+    node = FakeNode(wallet, amounts, block_size=10, dropped_sequence=112)
+
+    results = _submit(node, wallet, amounts, window=20)
+
+    assert all(result.included for result in results)
+    assert [result.sequence for result in results] == list(range(100, 130))
+    assert [amount for block in node.blocks for amount in block] == amounts
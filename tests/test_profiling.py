@@ -0,0 +1,35 @@
+from chainlibpy import profiling
+from chainlibpy.generated import common
+from chainlibpy.generated.common import SecretKey
+
+
+def test_profile_records_calls_by_symbol():
+    with profiling.profile() as profiler:
+        key = SecretKey.from_hex("aa" * 32)
+        for _ in range(3):
+            key.to_hex()
+        key.close()
+
+    snapshot = profiler.snapshot()
+    from_hex = snapshot["common_ad00_SecretKey_from_hex"]
+    to_hex = snapshot["common_ad00_SecretKey_to_hex"]
+    assert from_hex["calls"] == 1
+    assert from_hex["lower_s"] > 0
+    assert to_hex["calls"] == 3
+    assert to_hex["lift_s"] > 0
+    assert 0 < to_hex["p50_s"] <= to_hex["p99_s"] <= to_hex["max_s"]
+    assert snapshot["ffi_common_ad00_SecretKey_object_free"]["calls"] == 1
+
+
+def test_disabled_profiling_leaves_bindings_untouched():
+    rust_call = common.rust_call
+    lower = common.FfiConverterString.__dict__["lower"]
+
+    with profiling.profile():
+        assert common.rust_call is not rust_call
+        assert profiling.is_enabled()
+
+    assert not profiling.is_enabled()
+    assert profiling.snapshot() == {}
+    assert common.rust_call is rust_call
+    assert common.FfiConverterString.__dict__["lower"] is lower
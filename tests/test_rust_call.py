@@ -0,0 +1,66 @@
+import ctypes
+import threading
+
+import pytest
+
+from chainlibpy.generated.common import (
+    FfiConverterString,
+    InternalError,
+    RustCallStatus,
+    rust_call,
+)
+
+# Python callables with the calling convention of a generated rust function, so that the
+# call status handling can be exercised without a dedicated native symbol.
+RUST_FN = ctypes.CFUNCTYPE(ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(RustCallStatus))
+
+
+@RUST_FN
+def double(value, status):
+    return value * 2
+
+
+@RUST_FN
+def panic_with_message(value, status):
+    # Like rust, only touch the status once the message has been built: lowering it makes a
+    # nested call on this thread, which shares the status.
+    message = FfiConverterString.lower(f"panicked on {value}")
+    status.contents.code = RustCallStatus.CALL_PANIC
+    status.contents.error_buf = message
+    return 0
+
+
+@RUST_FN
+def record_status_address(value, status):
+    return ctypes.addressof(status.contents) & 0x7FFFFFFF
+
+
+def test_rust_call_returns_result():
+    assert rust_call(double, 21) == 42
+
+
+def test_rust_call_resets_status_after_a_panic():
+    with pytest.raises(InternalError, match="panicked on 7"):
+        rust_call(panic_with_message, 7)
+
+    assert rust_call(double, 4) == 8
+    with pytest.raises(InternalError, match="panicked on 8"):
+        rust_call(panic_with_message, 8)
+
+
+def test_rust_call_status_is_reused_per_thread():
+    addresses = []
+
+    def call_twice():
+        addresses.append(
+            (rust_call(record_status_address, 0), rust_call(record_status_address, 0))
+        )
+
+    threads = [threading.Thread(target=call_twice) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(first == second for first, second in addresses)
+    assert len({first for first, _ in addresses}) == len(threads)
@@ -0,0 +1,84 @@
+import threading
+
+from chainlibpy.generated.common import (
+    CosmosSdkMsg,
+    RawRpcAccountStatus,
+    SingleCoin,
+    TxBroadcastResult,
+)
+from chainlibpy.sequence_manager import SequenceManager
+from chainlibpy.transaction import Transaction
+from chainlibpy.wallet import Wallet
+
+from .utils import ADDRESS, SEED
+
+
+class FakeClient:
+    def __init__(self, account_number: int, sequence: int) -> None:
+        self.account_number = account_number
+        self.sequence = sequence
+        self.queries = 0
+
+    def query_account(self, address: str) -> RawRpcAccountStatus:
+        self.queries += 1
+        return RawRpcAccountStatus(
+            "BaseAccount", address, None, self.account_number, self.sequence
+        )
+
+
+def test_sequences_are_handed_out_locally_across_threads():
+    client = FakeClient(7, 100)
+    manager = SequenceManager(client)
+    sequences = []
+
+    def reserve() -> None:
+        for _ in range(50):
+            sequences.append(manager.next_sequence(ADDRESS))
+
+    threads = [threading.Thread(target=reserve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(sequences) == list(range(100, 300))
+    assert manager.account_number(ADDRESS) == 7
+    assert client.queries == 1
+
+
+def test_sequence_mismatch_resynchronises():
+    client = FakeClient(7, 100)
+    manager = SequenceManager(client)
+    manager.next_sequence(ADDRESS)
+
+    assert not manager.update(ADDRESS, TxBroadcastResult("HASH", 0, ""))
+    mismatch = "account sequence mismatch, expected 90, got 101: incorrect account sequence"
+    assert manager.update(ADDRESS, TxBroadcastResult("", 32, mismatch))
+    assert manager.next_sequence(ADDRESS) == 90
+    assert client.queries == 1
+
+    client.sequence = 95
+    assert manager.update(ADDRESS, TxBroadcastResult("", 32, "incorrect account sequence"))
+    assert manager.next_sequence(ADDRESS) == 95
+    assert client.queries == 2
+
+
+def test_transaction_signs_without_querying_the_client():
+    client = FakeClient(7, 100)
+    manager = SequenceManager(client)
+    wallet = Wallet(SEED)
+    msgs = [CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.BASE_CRO(1))]
+
+    txs = [
+        Transaction("chain-maind", wallet, msgs, None, sequence_manager=manager) for _ in range(3)
+    ]
+    signed = [tx.signed_tx for tx in txs]
+
+    assert [tx.sequence for tx in txs] == [100, 101, 102]
+    assert txs[0].signed_tx == signed[0]
+    assert len(set(signed)) == 3
+    assert client.queries == 1
+
+    txs[0].reset_sequence()
+    assert txs[0].signed_tx != signed[0]
+    assert txs[0].sequence == 103
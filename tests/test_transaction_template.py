@@ -0,0 +1,36 @@
+from chainlibpy.generated.common import CosmosSdkMsg, SingleCoin
+from chainlibpy.transaction import Transaction, TransactionTemplate
+from chainlibpy.wallet import Wallet
+
+from .utils import ADDRESS, SEED
+
+CHAIN_ID = "crypto-org-chain-mainnet-1"
+FEE = SingleCoin.OTHER("5000", "basecro")
+
+
+def _msgs(amount: int):
+    return [CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.OTHER(str(amount), "basecro"))]
+
+
+def test_template_signs_like_transaction():
+    wallet = Wallet(SEED)
+    template = TransactionTemplate(
+        CHAIN_ID, wallet, 7, gas_limit=150_000, fee=FEE, memo="payout", timeout_height=900
+    )
+
+    for sequence in (0, 5, 2**40):
+        tx = Transaction(
+            CHAIN_ID,
+            wallet,
+            _msgs(sequence + 1),
+            7,
+            gas_limit=150_000,
+            fee=FEE,
+            memo="payout",
+            timeout_height=900,
+            sequence=sequence,
+        )
+        assert template.sign(sequence, _msgs(sequence + 1)) == tx.signed_tx
+
+    signed = list(template.sign_many((sequence, _msgs(sequence)) for sequence in range(3)))
+    assert signed == [template.sign(sequence, _msgs(sequence)) for sequence in range(3)]
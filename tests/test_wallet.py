@@ -2,12 +2,27 @@
 # Modifications Copyright (c) 2021-present, Crypto.org
 # (licensed under the Apache License, Version 2.0)
 
-from chainlibpy.wallet import Wallet
+import csv
+import json
+import time
+
+import pytest
+
+from chainlibpy.ffi_support import native_handle_stats
+from chainlibpy.generated.common import (
+    CosmosSdkMsg,
+    CosmosSdkTxInfo,
+    InternalError,
+    Network,
+    SingleCoin,
+)
+from chainlibpy.wallet import Wallet, export_wallets
+
+from .utils import ADDRESS, SEED
 
 
 def test_generate_wallet():
-    seed = "burst negative solar evoke traffic yard lizard next series foster seminar enter wrist captain bulb trap giggle country sword season shoot boy bargain deal"  # noqa: 501
-    wallet = Wallet(seed)
+    wallet = Wallet(SEED)
     assert wallet.private_key == bytes.fromhex(
         "dc81c553efffdce74035a194ea7a58f1d67bdfd1329e33f684460d9ed6223faf"
     )
@@ -20,3 +35,195 @@ def test_generate_wallet():
 def test_new_wallet():
     wallet = Wallet.new()
     assert len(str(wallet.private_key)) > 0
+
+
+def test_wallet_does_not_leak_native_handles():
+    live = native_handle_stats.snapshot()
+
+    with Wallet(SEED) as wallet:
+        for _ in range(10):
+            assert len(wallet.private_key) == 32
+            assert len(wallet.public_key) == 33
+        assert native_handle_stats.live("SecretKey") == live.get("SecretKey", 0) + 1
+
+    assert native_handle_stats.snapshot() == live
+
+
+def test_wallet_reuses_the_derived_key():
+    wallet = Wallet(SEED)
+    key = wallet.secret_key
+    address = wallet.address
+
+    assert wallet.secret_key is key
+    assert wallet.address == address
+
+    wallet.invalidate()
+    assert key.closed
+    assert wallet.secret_key is not key
+    assert wallet.address == address
+
+    key = wallet.secret_key
+    wallet.hrp = "tcro"
+    assert not key.closed
+    assert wallet.secret_key is key
+    assert wallet.address.startswith("tcro1")
+
+    wallet.path = "m/44'/394'/0'/0/1"
+    assert wallet.address != address
+
+    wallet.zeroize()
+    assert wallet.wallet.closed
+
+
+def test_derived_wallets_share_the_seed():
+    hd_wallets = native_handle_stats.live("HdWallet")
+
+    with Wallet(SEED) as wallet:
+        accounts = [wallet.account(index) for index in range(5)]
+
+        assert native_handle_stats.live("HdWallet") == hd_wallets + 1
+        assert all(account.wallet is wallet.wallet for account in accounts)
+        assert accounts[0].address == wallet.address
+        assert accounts[3].path == "m/44'/394'/0'/0/3"
+        assert len({account.address for account in accounts}) == 5
+
+        accounts[1].close()
+        assert not wallet.wallet.closed
+        assert wallet.derive("m/44'/394'/0'/0/1").address == accounts[1].address
+
+    assert native_handle_stats.live("HdWallet") == hd_wallets
+
+
+def test_derive_addresses_in_processes_matches_serial():
+    wallet = Wallet(SEED)
+
+    serial = list(wallet.derive_addresses(5, 40))
+    parallel = list(wallet.derive_addresses(5, 40, workers=2, chunk_size=7))
+
+    assert parallel == serial
+    assert serial[0] == wallet.account(5).address
+    assert len(set(serial)) == 40
+
+
+def test_wallet_from_secret_key_matches_seed_wallet():
+    wallet = Wallet(SEED)
+    tx_info = CosmosSdkTxInfo(
+        1, 2, 200_000, SingleCoin.BASE_CRO(1), 0, "", Network.OTHER("chain-maind", 394, "cro")
+    )
+    msgs = [CosmosSdkMsg.BANK_SEND(wallet.address, SingleCoin.BASE_CRO(1000))]
+
+    for secret_key in (wallet.private_key, wallet.private_key.hex()):
+        with Wallet.from_secret_key(secret_key) as key_wallet:
+            assert key_wallet.path is None
+            assert key_wallet.public_key == wallet.public_key
+            assert key_wallet.address == wallet.address
+            assert key_wallet.sign_tx(tx_info, msgs) == wallet.sign_tx(tx_info, msgs)
+
+            key_wallet.invalidate()
+            assert key_wallet.address == wallet.address
+            with pytest.raises(ValueError):
+                key_wallet.account(1)
+
+
+def test_closed_wallet_raises_instead_of_deriving_its_key_again():
+    wallet = Wallet(SEED)
+    key_wallet = Wallet.from_secret_key(wallet.private_key)
+    wallet.close()
+    key_wallet.close()
+
+    with pytest.raises(InternalError):
+        wallet.address
+    with pytest.raises(ValueError):
+        key_wallet.address
+
+
+@pytest.mark.parametrize("workers,processes", [(1, False), (4, False), (2, True)])
+def test_load_many_keeps_the_order_of_the_seeds(workers, processes):
+    seeds = [Wallet.new().wallet.get_backup_mnemonic_phrase() for _ in range(6)]
+    expected = [Wallet(seed).address for seed in seeds]
+    reported = []
+
+    wallets = Wallet.load_many(
+        seeds,
+        workers=workers,
+        processes=processes,
+        progress=lambda done, total: reported.append((done, total)),
+    )
+
+    assert [wallet.address for wallet in wallets] == expected
+    assert reported == [(done, 6) for done in range(1, 7)]
+
+
+def _payout_items(count):
+    tx_info_network = Network.OTHER("chain-maind", 394, "cro")
+    fee = SingleCoin.BASE_CRO(1)
+    for sequence in range(count):
+        tx_info = CosmosSdkTxInfo(
+            1, sequence, 200_000, fee, 0, f"payout {sequence}", tx_info_network
+        )
+        yield tx_info, [CosmosSdkMsg.BANK_SEND(ADDRESS, SingleCoin.BASE_CRO(sequence + 1))]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_sign_txs_matches_sign_tx(workers):
+    wallet = Wallet(SEED)
+    expected = [wallet.sign_tx(tx_info, msgs) for tx_info, msgs in _payout_items(50)]
+
+    signed = wallet.sign_txs(_payout_items(50), workers=workers)
+
+    assert next(signed) == expected[0]
+    assert [expected[0]] + list(signed) == expected
+
+
+def test_sign_txs_throughput(record_property):
+    wallet = Wallet(SEED)
+    items = list(_payout_items(2_000))
+
+    start = time.perf_counter()
+    for tx_info, msgs in items:
+        wallet.sign_tx(tx_info, msgs)
+    sign_tx_elapsed = time.perf_counter() - start
+
+    record_property("sign_tx_per_s", len(items) / sign_tx_elapsed)
+    for workers in (1, 4):
+        start = time.perf_counter()
+        assert sum(1 for _ in wallet.sign_txs(items, workers=workers)) == len(items)
+        record_property(
+            f"sign_txs_{workers}_workers_per_s", len(items) / (time.perf_counter() - start)
+        )
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_generate_many_creates_distinct_wallets(workers):
+    hd_wallets = native_handle_stats.live("HdWallet")
+
+    wallets = Wallet.generate_many(8, hrp="tcro", workers=workers)
+
+    assert native_handle_stats.live("HdWallet") == hd_wallets + 8
+    assert len({wallet.address for wallet in wallets}) == 8
+    assert all(wallet.address.startswith("tcro1") for wallet in wallets)
+    mnemonic = wallets[0].wallet.get_backup_mnemonic_phrase()
+    assert Wallet(mnemonic, hrp="tcro").address == wallets[0].address
+
+
+def test_export_wallets(tmp_path):
+    wallets = Wallet.generate_many(3)
+    expected = [
+        {
+            "mnemonic": wallet.wallet.get_backup_mnemonic_phrase(),
+            "address": wallet.address,
+            "public_key": wallet.public_key.hex(),
+        }
+        for wallet in wallets
+    ]
+
+    assert export_wallets(iter(wallets), tmp_path / "wallets.csv") == 3
+    with open(tmp_path / "wallets.csv", newline="") as f:
+        assert list(csv.DictReader(f)) == expected
+
+    assert export_wallets(wallets, tmp_path / "wallets.jsonl", "jsonl") == 3
+    with open(tmp_path / "wallets.jsonl") as f:
+        assert [json.loads(line) for line in f] == expected
+
+    with pytest.raises(ValueError):
+        export_wallets([Wallet.from_secret_key(wallets[0].private_key)], tmp_path / "key.csv")
@@ -19,6 +19,10 @@ BOB = "bob"
 CRO_DENOM = "cro"
 BASECRO_DENOM = "basecro"
 
+# mnemonic of the wallets in unit tests, and the address of its default derivation path
+SEED = "burst negative solar evoke traffic yard lizard next series foster seminar enter wrist captain bulb trap giggle country sword season shoot boy bargain deal"  # noqa: 501
+ADDRESS = "cro1yj3fd8gxrqd2662p8ywp26t4hfws9p5n75xjum"
+
 
 def wait_for_block(cli, height, timeout=240):
     for _ in range(timeout * 2):